@@ -1,32 +1,91 @@
 """API routes for CLI Proxy API.
 """
 
-import json
-from typing import Dict, Any, List, AsyncGenerator
-from fastapi import APIRouter, HTTPException, Request, Depends
-from fastapi.responses import JSONResponse, StreamingResponse
+import asyncio
+from typing import Dict, Any, List, AsyncGenerator, Literal
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 
 from ..auth.manager import AuthManager
 from ..providers.registry import ProviderRegistry
 from ..translator.registry import TranslatorRegistry
 
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    import json
+    _dumps = lambda obj: json.dumps(obj).encode()
+    _loads = json.loads
+
 router = APIRouter()
 
+# Server-sent event framing
+_DATA_PREFIX = b"data: "
+_FRAME_END = b"\n\n"
+_DONE = b"data: [DONE]\n\n"
+
+# Path parameter types, validated by the router before a handler runs
+ProviderName = Literal["openai", "gemini", "claude", "qwen", "iflow"]
+ApiFormat = Literal["openai", "gemini", "claude"]
 
-# Dependency injection functions
-async def get_auth_manager(request: Request) -> AuthManager:
-    """Get auth manager from app state."""
-    return request.app.state.auth_manager
 
+async def _parse_json(request: Request) -> Any:
+    """Parse the request body as JSON straight from bytes."""
+    try:
+        return _loads(await request.body())
+    except ValueError:
+        # orjson.JSONDecodeError and json.JSONDecodeError both subclass ValueError
+        raise HTTPException(status_code=400, detail="Invalid JSON body")
 
-async def get_provider_registry(request: Request) -> ProviderRegistry:
-    """Get provider registry from app state."""
-    return request.app.state.provider_registry
 
+# Static response payloads, serialized once at import time
+_MODELS_BYTES = _dumps({
+    "object": "list",
+    "data": [
+        {
+            "id": "gpt-3.5-turbo",
+            "object": "model",
+            "created": 1677610602,
+            "owned_by": "openai",
+        },
+        {
+            "id": "gpt-4",
+            "object": "model",
+            "created": 1687882411,
+            "owned_by": "openai",
+        },
+        {
+            "id": "gemini-pro",
+            "object": "model",
+            "created": 1692902400,
+            "owned_by": "google",
+        },
+        {
+            "id": "claude-3-opus",
+            "object": "model",
+            "created": 1704067200,
+            "owned_by": "anthropic",
+        },
+    ],
+})
 
-async def get_translator_registry(request: Request) -> TranslatorRegistry:
-    """Get translator registry from app state."""
-    return request.app.state.translator_registry
+_SYSINFO_BYTES = _dumps({
+    "name": "CLI Proxy API",
+    "version": "1.0.0",
+    "description": "OpenAI/Gemini/Claude compatible API proxy for CLI tools",
+    "supported_providers": ["openai", "gemini", "claude", "qwen", "iflow"],
+    "endpoints": {
+        "chat_completions": "/v1/chat/completions",
+        "models": "/v1/models",
+        "auth": "/v1/auth/{provider}",
+        "providers": "/v1/providers",
+        "translate": "/v1/translate/{source}/{target}",
+        "health": "/v1/health",
+        "system_info": "/v1/system/info",
+    },
+})
 
 
 # Health check endpoint
@@ -38,321 +97,277 @@ async def health_check():
 
 # OpenAI-compatible endpoints
 @router.post("/chat/completions")
-async def chat_completions(
-    request: Request,
-    provider_registry: ProviderRegistry = Depends(get_provider_registry),
-):
+async def chat_completions(request: Request):
     """
     OpenAI-compatible chat completions endpoint.
     
     This endpoint accepts OpenAI format requests and routes them to the
     appropriate provider.
     """
-    try:
-        # Parse request body
-        request_data = await request.json()
-        
-        # Extract required fields
-        model = request_data.get("model")
-        messages = request_data.get("messages", [])
-        
-        if not model:
-            raise HTTPException(status_code=400, detail="Model is required")
-        
-        if not messages:
-            raise HTTPException(status_code=400, detail="Messages are required")
-        
-        # Extract optional parameters
-        temperature = request_data.get("temperature")
-        max_tokens = request_data.get("max_tokens")
-        top_p = request_data.get("top_p")
-        frequency_penalty = request_data.get("frequency_penalty")
-        presence_penalty = request_data.get("presence_penalty")
-        stop = request_data.get("stop")
-        stream = request_data.get("stream", False)
-        
-        # Prepare kwargs for provider
-        kwargs = {}
-        if temperature is not None:
-            kwargs["temperature"] = temperature
-        if max_tokens is not None:
-            kwargs["max_tokens"] = max_tokens
-        if top_p is not None:
-            kwargs["top_p"] = top_p
-        if frequency_penalty is not None:
-            kwargs["frequency_penalty"] = frequency_penalty
-        if presence_penalty is not None:
-            kwargs["presence_penalty"] = presence_penalty
-        if stop is not None:
-            kwargs["stop"] = stop
-        if stream is not None:
-            kwargs["stream"] = stream
+    provider_registry: ProviderRegistry = request.app.state.provider_registry
+    
+    # Parse request body
+    request_data = await _parse_json(request)
+    
+    # Extract required fields
+    model = request_data.get("model")
+    messages = request_data.get("messages", [])
+    
+    if not model:
+        raise HTTPException(status_code=400, detail="Model is required")
+    
+    if not messages:
+        raise HTTPException(status_code=400, detail="Messages are required")
+    
+    # Extract optional parameters
+    temperature = request_data.get("temperature")
+    max_tokens = request_data.get("max_tokens")
+    top_p = request_data.get("top_p")
+    frequency_penalty = request_data.get("frequency_penalty")
+    presence_penalty = request_data.get("presence_penalty")
+    stop = request_data.get("stop")
+    stream = request_data.get("stream", False)
+    
+    # Prepare kwargs for provider
+    kwargs = {}
+    if temperature is not None:
+        kwargs["temperature"] = temperature
+    if max_tokens is not None:
+        kwargs["max_tokens"] = max_tokens
+    if top_p is not None:
+        kwargs["top_p"] = top_p
+    if frequency_penalty is not None:
+        kwargs["frequency_penalty"] = frequency_penalty
+    if presence_penalty is not None:
+        kwargs["presence_penalty"] = presence_penalty
+    if stop is not None:
+        kwargs["stop"] = stop
+    if stream is not None:
+        kwargs["stream"] = stream
+    
+    # Check if streaming is requested
+    if stream:
+        config = request.app.state.config
+        flush_bytes = config.stream_flush_bytes
+        flush_interval = config.stream_flush_interval
         
-        # Check if streaming is requested
-        if stream:
-            # Return streaming response
-            async def generate_stream() -> AsyncGenerator[str, None]:
-                async for chunk in provider_registry.chat_completion_stream(
-                    model=model,
-                    messages=messages,
-                    **kwargs
-                ):
-                    yield f"data: {json.dumps(chunk)}\n\n"
-                yield "data: [DONE]\n\n"
-            
-            return StreamingResponse(
-                generate_stream(),
-                media_type="text/event-stream",
-                headers={
-                    "Cache-Control": "no-cache",
-                    "Connection": "keep-alive",
-                    "X-Accel-Buffering": "no",
-                }
-            )
+        # Return streaming response, coalescing frames into fewer writes.
+        # The stream contract is async-only: providers must implement
+        # chat_completion_stream as an async generator (checked at startup),
+        # since StreamingResponse runs sync iterators in a threadpool.
+        async def generate_stream() -> AsyncGenerator[bytes, None]:
+            loop = asyncio.get_running_loop()
+            chunks = provider_registry.chat_completion_stream(
+                model=model,
+                messages=messages,
+                **kwargs
+            ).__aiter__()
+            buf = bytearray()
+            first_buffered = 0.0
+            pending = None
+            try:
+                while True:
+                    # Buffered frames wait at most flush_interval for company,
+                    # even if upstream pauses (e.g. before a tool call). Only
+                    # a bounded wait needs the next read wrapped in a task;
+                    # it is reused across timer wakeups until it completes
+                    if buf:
+                        if pending is None:
+                            pending = asyncio.ensure_future(chunks.__anext__())
+                        remaining = flush_interval - (loop.time() - first_buffered)
+                        if remaining > 0:
+                            await asyncio.wait((pending,), timeout=remaining)
+                        if not pending.done():
+                            yield bytes(buf)
+                            buf.clear()
+                            continue
+                    
+                    try:
+                        chunk = await (pending if pending is not None else chunks.__anext__())
+                    except StopAsyncIteration:
+                        break
+                    finally:
+                        pending = None
+                    
+                    if not buf:
+                        first_buffered = loop.time()
+                    buf += _DATA_PREFIX + _dumps(chunk) + _FRAME_END
+                    if len(buf) >= flush_bytes:
+                        yield bytes(buf)
+                        buf.clear()
+            except Exception:
+                # Deliver frames upstream already produced before the error
+                if buf:
+                    yield bytes(buf)
+                raise
+            finally:
+                if pending is not None:
+                    pending.cancel()
+            buf += _DONE
+            yield bytes(buf)
         
-        # Get completion from provider registry (non-streaming)
-        response = await provider_registry.chat_completion(
-            model=model,
-            messages=messages,
-            **kwargs
+        return StreamingResponse(
+            generate_stream(),
+            media_type="text/event-stream",
+            headers={
+                "Cache-Control": "no-cache",
+                "Connection": "keep-alive",
+                "X-Accel-Buffering": "no",
+            }
         )
-        
-        return response
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+    
+    # Get completion from provider registry (non-streaming)
+    response = await provider_registry.chat_completion(
+        model=model,
+        messages=messages,
+        **kwargs
+    )
+    
+    return response
 
 
-@router.get("/models")
-async def list_models(
-    provider_registry: ProviderRegistry = Depends(get_provider_registry),
-):
+@router.get("/models", response_class=ORJSONResponse)
+async def list_models():
     """
     List available models from all providers.
     
     Returns a combined list of models from all enabled providers.
     """
-    try:
-        # This would normally aggregate models from all providers
-        # For now, return a static list
-        models = [
-            {
-                "id": "gpt-3.5-turbo",
-                "object": "model",
-                "created": 1677610602,
-                "owned_by": "openai",
-            },
-            {
-                "id": "gpt-4",
-                "object": "model",
-                "created": 1687882411,
-                "owned_by": "openai",
-            },
-            {
-                "id": "gemini-pro",
-                "object": "model",
-                "created": 1692902400,
-                "owned_by": "google",
-            },
-            {
-                "id": "claude-3-opus",
-                "object": "model",
-                "created": 1704067200,
-                "owned_by": "anthropic",
-            },
-        ]
-        
-        return {
-            "object": "list",
-            "data": models,
-        }
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+    # This would normally aggregate models from all providers
+    # For now, return a static list serialized once at import time
+    return Response(content=_MODELS_BYTES, media_type="application/json")
 
 
 # Authentication endpoints
 @router.post("/auth/{provider_name}")
-async def authenticate(
-    provider_name: str,
-    request: Request,
-    auth_manager: AuthManager = Depends(get_auth_manager),
-):
+async def authenticate(provider_name: ProviderName, request: Request):
     """
     Authenticate with a provider.
     
     Supports API key authentication for most providers.
     """
-    try:
-        request_data = await request.json()
-        
-        # Extract authentication parameters
-        api_key = request_data.get("api_key")
-        key_id = request_data.get("key_id", api_key[:8] if api_key else "default")
-        
-        if not api_key:
-            raise HTTPException(status_code=400, detail="API key is required")
-        
-        # Authenticate
-        auth_result = await auth_manager.authenticate(
-            provider_name=provider_name,
-            key_id=key_id,
-            api_key=api_key,
+    auth_manager: AuthManager = request.app.state.auth_manager
+    
+    request_data = await _parse_json(request)
+    
+    # Extract authentication parameters
+    api_key = request_data.get("api_key")
+    if not api_key:
+        raise HTTPException(status_code=400, detail="API key is required")
+    
+    key_id = request_data.get("key_id") or api_key[:8]
+    
+    # Authenticate
+    auth_result = await auth_manager.authenticate(
+        provider_name=provider_name,
+        key_id=key_id,
+        api_key=api_key,
+    )
+    
+    if not auth_result.success:
+        raise HTTPException(
+            status_code=401,
+            detail=auth_result.error or "Authentication failed",
         )
-        
-        if not auth_result.success:
-            raise HTTPException(
-                status_code=401,
-                detail=auth_result.error or "Authentication failed",
-            )
-        
-        return {
-            "success": True,
-            "provider": provider_name,
-            "key_id": key_id,
-            "token_data": auth_result.token_data.to_dict() if auth_result.token_data else None,
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+    
+    return {
+        "success": True,
+        "provider": provider_name,
+        "key_id": key_id,
+        "token_data": auth_result.token_data.to_dict() if auth_result.token_data else None,
+    }
 
 
-@router.get("/auth/{provider_name}/tokens")
-async def list_tokens(
-    provider_name: str,
-    auth_manager: AuthManager = Depends(get_auth_manager),
-):
+@router.get("/auth/{provider_name}/tokens", response_class=ORJSONResponse)
+async def list_tokens(provider_name: ProviderName, request: Request):
     """
     List tokens for a provider.
     """
-    try:
-        tokens = await auth_manager.list_tokens(provider_name)
-        return {
-            "provider": provider_name,
-            "tokens": tokens,
-        }
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+    auth_manager: AuthManager = request.app.state.auth_manager
+    tokens = await auth_manager.list_tokens(provider_name)
+    return {
+        "provider": provider_name,
+        "tokens": tokens,
+    }
 
 
-@router.delete("/auth/{provider_name}/{key_id}")
-async def delete_token(
-    provider_name: str,
-    key_id: str,
-    auth_manager: AuthManager = Depends(get_auth_manager),
-):
+@router.delete("/auth/{provider_name}/{key_id}", response_class=ORJSONResponse)
+async def delete_token(provider_name: ProviderName, key_id: str, request: Request):
     """
     Delete a token.
     """
-    try:
-        success = await auth_manager.delete_token(provider_name, key_id)
-        return {
-            "success": success,
-            "provider": provider_name,
-            "key_id": key_id,
-        }
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+    auth_manager: AuthManager = request.app.state.auth_manager
+    success = await auth_manager.delete_token(provider_name, key_id)
+    return {
+        "success": success,
+        "provider": provider_name,
+        "key_id": key_id,
+    }
 
 
 # Provider management endpoints
-@router.get("/providers")
-async def list_providers(
-    provider_registry: ProviderRegistry = Depends(get_provider_registry),
-):
+@router.get("/providers", response_class=ORJSONResponse)
+async def list_providers(request: Request):
     """
     List all providers and their status.
     """
-    try:
-        providers = provider_registry.list_providers()
-        return {
-            "providers": providers,
-        }
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+    provider_registry: ProviderRegistry = request.app.state.provider_registry
+    providers = provider_registry.list_providers()
+    return {
+        "providers": providers,
+    }
 
 
-@router.get("/providers/stats")
-async def get_provider_stats(
-    provider_registry: ProviderRegistry = Depends(get_provider_registry),
-):
+@router.get("/providers/stats", response_class=ORJSONResponse)
+async def get_provider_stats(request: Request):
     """
     Get overall provider statistics.
     """
-    try:
-        stats = provider_registry.get_overall_stats()
-        return stats
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+    provider_registry: ProviderRegistry = request.app.state.provider_registry
+    stats = provider_registry.get_overall_stats()
+    return stats
 
 
 # Translation endpoints
 @router.post("/translate/{source_format}/{target_format}")
 async def translate_request(
-    source_format: str,
-    target_format: str,
+    source_format: ApiFormat,
+    target_format: ApiFormat,
     request: Request,
-    translator_registry: TranslatorRegistry = Depends(get_translator_registry),
 ):
     """
     Translate a request from one format to another.
     
     Useful for testing and debugging translation logic.
     """
-    try:
-        request_data = await request.json()
-        
-        translation_result = await translator_registry.translate_request(
-            source_format=source_format,
-            target_format=target_format,
-            request_data=request_data,
+    translator_registry: TranslatorRegistry = request.app.state.translator_registry
+    
+    request_data = await _parse_json(request)
+    
+    translation_result = await translator_registry.translate_request(
+        source_format=source_format,
+        target_format=target_format,
+        request_data=request_data,
+    )
+    
+    if not translation_result.success:
+        raise HTTPException(
+            status_code=400,
+            detail=translation_result.error or "Translation failed",
         )
-        
-        if not translation_result.success:
-            raise HTTPException(
-                status_code=400,
-                detail=translation_result.error or "Translation failed",
-            )
-        
-        return {
-            "success": True,
-            "source_format": source_format,
-            "target_format": target_format,
-            "translated_data": translation_result.translated_data,
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+    
+    return {
+        "success": True,
+        "source_format": source_format,
+        "target_format": target_format,
+        "translated_data": translation_result.translated_data,
+    }
 
 
 # System information endpoint
-@router.get("/system/info")
+@router.get("/system/info", response_class=ORJSONResponse)
 async def system_info():
     """
     Get system information.
     """
-    return {
-        "name": "CLI Proxy API",
-        "version": "1.0.0",
-        "description": "OpenAI/Gemini/Claude compatible API proxy for CLI tools",
-        "supported_providers": ["openai", "gemini", "claude", "qwen", "iflow"],
-        "endpoints": {
-            "chat_completions": "/v1/chat/completions",
-            "models": "/v1/models",
-            "auth": "/v1/auth/{provider}",
-            "providers": "/v1/providers",
-            "translate": "/v1/translate/{source}/{target}",
-            "health": "/v1/health",
-            "system_info": "/v1/system/info",
-        },
-    }
+    return Response(content=_SYSINFO_BYTES, media_type="application/json")
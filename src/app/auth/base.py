@@ -4,16 +4,23 @@ Defines the common interface for all authentication providers.
 """
 
 import abc
+import asyncio
 import base64
+import contextlib
 import hashlib
 import secrets
-from datetime import datetime, timedelta
+import time
+import weakref
+from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
 
+from cachetools import LRUCache, TTLCache
 from pydantic import BaseModel
 
+from ..utils.http_client import get_http_client
+
 
 class AuthType(Enum):
     """Authentication type enumeration."""
@@ -31,7 +38,7 @@ class TokenStatus(Enum):
     REFRESH_NEEDED = "refresh_needed"
 
 
-@dataclass
+@dataclass(slots=True)
 class TokenData:
     """Token data structure."""
     access_token: str
@@ -44,28 +51,49 @@ class TokenData:
     user_id: Optional[str] = None
     organization_id: Optional[str] = None
     extra_data: Optional[Dict[str, Any]] = None
+    _expires_ts: Optional[float] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        """Cache expires_at as a UNIX timestamp for cheap expiry checks."""
+        expires_at = self.expires_at
+        if expires_at:
+            # Naive datetimes in this codebase are UTC (datetime.utcnow())
+            if expires_at.tzinfo is None:
+                expires_at = expires_at.replace(tzinfo=timezone.utc)
+            self._expires_ts = expires_at.timestamp()
+    
+    @property
+    def expires_ts(self) -> Optional[float]:
+        """Expiry as a UNIX timestamp, or None if the token does not expire."""
+        return self._expires_ts
     
     def is_expired(self) -> bool:
         """Check if token is expired."""
-        if not self.expires_at:
-            return False
-        return datetime.utcnow() >= self.expires_at
+        return self._expires_ts is not None and time.time() >= self._expires_ts
     
     def expires_in(self) -> Optional[int]:
         """Get seconds until expiration."""
-        if not self.expires_at:
+        if self._expires_ts is None:
             return None
-        delta = self.expires_at - datetime.utcnow()
-        return max(0, int(delta.total_seconds()))
+        return max(0, int(self._expires_ts - time.time()))
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
-        result = asdict(self)
-        # Convert datetime to ISO format string
-        for key in ["expires_at", "issued_at"]:
-            if result[key] and isinstance(result[key], datetime):
-                result[key] = result[key].isoformat()
-        return result
+        expires_at = self.expires_at
+        issued_at = self.issued_at
+        return {
+            "access_token": self.access_token,
+            "refresh_token": self.refresh_token,
+            "token_type": self.token_type,
+            # Convert datetime to ISO format string
+            "expires_at": expires_at.isoformat() if expires_at else None,
+            "issued_at": issued_at.isoformat() if issued_at else None,
+            "scope": self.scope,
+            "email": self.email,
+            "user_id": self.user_id,
+            "organization_id": self.organization_id,
+            "extra_data": self.extra_data,
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "TokenData":
@@ -77,7 +105,7 @@ class TokenData:
         return cls(**data)
 
 
-@dataclass
+@dataclass(slots=True)
 class AuthResult:
     """Authentication result."""
     success: bool
@@ -138,17 +166,27 @@ class PKCECodes:
         # According to RFC 7636, code verifier must be:
         # - 43-128 characters
         # - A-Z, a-z, 0-9, -, ., _, ~
-        alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~"
-        return ''.join(secrets.choice(alphabet) for _ in range(length))
+        # URL-safe base64 only uses A-Z, a-z, 0-9, - and _, so a single
+        # random draw sliced to length stays within the allowed alphabet.
+        return secrets.token_urlsafe(length)[:length]
     
     @staticmethod
     def generate_code_challenge(code_verifier: str) -> str:
         """Generate code challenge from code verifier."""
         # SHA256 hash, then base64url encode without padding
         sha256_hash = hashlib.sha256(code_verifier.encode()).digest()
-        code_challenge = base64.urlsafe_b64encode(sha256_hash).decode().replace("=", "")
+        code_challenge = base64.urlsafe_b64encode(sha256_hash).rstrip(b"=").decode()
         return code_challenge
     
+    @classmethod
+    def acquire(cls) -> "PKCECodes":
+        """Take pre-generated codes from the pool, or generate fresh ones if it is empty."""
+        try:
+            return _get_pkce_pool().get_nowait()
+        except (RuntimeError, asyncio.QueueEmpty):
+            # No running loop (hence no pool), or the pool is drained
+            return cls()
+    
     def to_dict(self) -> Dict[str, str]:
         """Convert to dictionary."""
         return {
@@ -157,6 +195,58 @@ class PKCECodes:
         }
 
 
+# Pools of pre-generated PKCE codes, kept full by fill_pkce_pool(). A queue
+# binds to the loop it first waits on, so each event loop gets its own
+PKCE_POOL_SIZE = 64
+_pkce_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Queue[PKCECodes]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_pkce_pool() -> "asyncio.Queue[PKCECodes]":
+    """
+    Get the PKCE pool of the running event loop, creating it on first use.
+    
+    Returns:
+        Queue of pre-generated PKCE codes
+        
+    Raises:
+        RuntimeError: If no event loop is running
+    """
+    loop = asyncio.get_running_loop()
+    pool = _pkce_pools.get(loop)
+    if pool is None:
+        pool = _pkce_pools[loop] = asyncio.Queue(maxsize=PKCE_POOL_SIZE)
+    return pool
+
+
+async def fill_pkce_pool() -> None:
+    """Keep the PKCE pool topped up. Intended to run as a background task."""
+    pool = _get_pkce_pool()
+    while True:
+        # Generate off the event loop; put() blocks while the pool is full
+        codes = await asyncio.to_thread(PKCECodes)
+        await pool.put(codes)
+
+
+# Maximum number of tokens whose default headers are cached per provider
+HEADER_CACHE_SIZE = 256
+VALIDATION_CACHE_SIZE = 1024
+
+# Enough of an error body to show in a message
+ERROR_SNIPPET_BYTES = 200
+
+# URLs starting with one of these are used as-is instead of joined to a base URL
+ABSOLUTE_URL_PREFIXES = ("http://", "https://")
+
+# Cache validators reused by conditional validation probes:
+# (response header, conditional request header, extra_data field)
+PROBE_VALIDATORS = (
+    ("ETag", "If-None-Match", "models_etag"),
+    ("Last-Modified", "If-Modified-Since", "models_last_modified"),
+)
+
+
 class BaseAuthProvider(abc.ABC):
     """Base class for all authentication providers."""
     
@@ -167,11 +257,34 @@ class BaseAuthProvider(abc.ABC):
         Args:
             provider_name: Name of the provider (e.g., "gemini", "claude")
             config: Application configuration
-            http_client: HTTP client for making requests
+            http_client: HTTP client for making requests (defaults to the
+                shared pooled client)
         """
         self.provider_name = provider_name
         self.config = config
-        self.http_client = http_client
+        self.http_client = http_client if http_client is not None else get_http_client(config)
+        self._header_cache: LRUCache = LRUCache(maxsize=HEADER_CACHE_SIZE)
+        self._validation_cache: TTLCache = TTLCache(
+            maxsize=VALIDATION_CACHE_SIZE,
+            ttl=getattr(config, "api_key_validation_ttl", 0),
+        )
+        self._inflight: Dict[str, "asyncio.Task[Any]"] = {}
+        
+        # Cap validation probes so bursts can't exhaust the pool or upstream limits
+        max_validations = getattr(config, "max_concurrent_validations", 0)
+        self._validation_limit = (
+            asyncio.Semaphore(max_validations) if max_validations > 0 else contextlib.nullcontext()
+        )
+        
+        # Headers that don't depend on the token never change after init
+        provider_config = self.get_provider_config()
+        extra_headers = provider_config and getattr(provider_config[0], "headers", None)
+        self._static_headers: Dict[str, str] = {
+            "Content-Type": "application/json",
+            "User-Agent": f"CLIProxyAPI-Python/1.0.0 ({provider_name})",
+        }
+        if extra_headers:
+            self._static_headers.update(extra_headers)
     
     @abc.abstractmethod
     async def authenticate(self, **kwargs) -> AuthResult:
@@ -209,6 +322,64 @@ class BaseAuthProvider(abc.ABC):
         """
         pass
     
+    async def authenticate_many(
+        self,
+        credentials: List[Dict[str, Any]],
+        concurrency: int = 20,
+    ) -> List[AuthResult]:
+        """
+        Authenticate several credentials concurrently.
+        
+        Args:
+            credentials: List of keyword-argument dicts for authenticate()
+            concurrency: Maximum number of authentications in flight
+            
+        Returns:
+            AuthResults in the same order as credentials
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def authenticate_one(kwargs: Dict[str, Any]) -> AuthResult:
+            async with semaphore:
+                return await self.authenticate(**kwargs)
+        
+        return list(await asyncio.gather(*map(authenticate_one, credentials)))
+    
+    async def validate_many(
+        self,
+        tokens: List[TokenData],
+        concurrency: int = 20,
+    ) -> List[TokenStatus]:
+        """
+        Validate several tokens concurrently.
+        
+        Args:
+            tokens: Tokens to validate
+            concurrency: Maximum number of validations in flight
+            
+        Returns:
+            TokenStatuses in the same order as tokens
+        """
+        # Settle expired tokens against one clock reading, without scheduling a task
+        now = time.time()
+        statuses: List[Optional[TokenStatus]] = [
+            TokenStatus.EXPIRED
+            if token_data.access_token and token_data.expires_ts is not None and now >= token_data.expires_ts
+            else None
+            for token_data in tokens
+        ]
+        pending = [i for i, status in enumerate(statuses) if status is None]
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def validate_one(token_data: TokenData) -> TokenStatus:
+            async with semaphore:
+                return await self.validate_token(token_data)
+        
+        results = await asyncio.gather(*(validate_one(tokens[i]) for i in pending))
+        for i, status in zip(pending, results):
+            statuses[i] = status
+        return statuses
+    
     async def get_auth_url(self, **kwargs) -> AuthResult:
         """
         Get OAuth authorization URL (for OAuth providers).
@@ -234,11 +405,13 @@ class BaseAuthProvider(abc.ABC):
     
     def generate_state(self) -> str:
         """Generate a random state for OAuth."""
+        # A single non-blocking getrandom() call (~1µs), cheap enough to run
+        # on the event loop; unlike PKCE codes it needs no hashing or pool
         return secrets.token_urlsafe(32)
     
     def create_pkce_codes(self) -> PKCECodes:
         """Create PKCE codes for OAuth."""
-        return PKCECodes()
+        return PKCECodes.acquire()
     
     async def logout(self, token_data: TokenData) -> bool:
         """
@@ -258,6 +431,129 @@ class BaseAuthProvider(abc.ABC):
         """Get provider-specific configuration from app config."""
         return self.config.get_provider_config(self.provider_name)
     
+    def _validation_cache_key(self, api_key: str, base_url: str) -> str:
+        """Hash the key so raw API keys are never held in the cache."""
+        return hashlib.sha256(f"{api_key}{base_url}".encode()).hexdigest()
+    
+    def _is_validation_cached(self, api_key: str, base_url: str) -> bool:
+        """Check whether an API key was successfully validated within the TTL."""
+        return self._validation_cache_key(api_key, base_url) in self._validation_cache
+    
+    def is_recently_validated(self, token_data: TokenData) -> bool:
+        """
+        Check the validation_time stamped on the token, which survives restarts.
+        
+        Args:
+            token_data: Token data to check
+            
+        Returns:
+            True if the token was validated within the validation TTL
+        """
+        validation_time = token_data.extra_data and token_data.extra_data.get("validation_time")
+        if not validation_time:
+            return False
+        try:
+            validated_at = datetime.fromisoformat(validation_time)
+        except (TypeError, ValueError):
+            return False
+        ttl = getattr(self.config, "api_key_validation_ttl", 0)
+        return (datetime.utcnow() - validated_at).total_seconds() < ttl
+    
+    def _remember_validation(self, api_key: str, base_url: str) -> None:
+        """Record a successful API key validation."""
+        self._validation_cache[self._validation_cache_key(api_key, base_url)] = True
+    
+    def _forget_validation(self, api_key: str, base_url: str) -> None:
+        """Drop a cached validation, e.g. after the upstream rejected the key."""
+        self._validation_cache.pop(self._validation_cache_key(api_key, base_url), None)
+    
+    def invalidate_token(self, token_data: TokenData) -> None:
+        """
+        Forget any cached validation for a token that is being removed.
+        
+        Args:
+            token_data: Token data being deleted or logged out
+        """
+        base_url = (token_data.extra_data or {}).get("base_url") or getattr(self, "base_url", "")
+        self._forget_validation(token_data.access_token, base_url)
+    
+    async def _coalesce(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Share one in-flight call between concurrent callers using the same key.
+        
+        Args:
+            key: Identifies calls that are interchangeable
+            call: Zero-argument coroutine function to run if none is in flight
+            
+        Returns:
+            Result of the shared call
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        
+        # Shield so one caller being cancelled doesn't cancel the others
+        return await asyncio.shield(task)
+    
+    async def _probe_status(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        timeout: float,
+        token_data: Optional[TokenData] = None,
+    ) -> Tuple[int, str]:
+        """
+        GET a URL only to learn whether it succeeds.
+        
+        The response is streamed so a successful body is never downloaded;
+        on failure only enough of it is read for an error message. Transient
+        failures (429/5xx, timeouts) are retried by the HTTP client.
+        
+        When token_data is given, the ETag/Last-Modified of its previous
+        successful probe are sent as a conditional GET; a 304 answer has no
+        body at all and is reported as 200.
+        
+        Args:
+            url: URL to request
+            headers: Request headers
+            timeout: Request timeout in seconds
+            token_data: Token whose probe validators are reused and updated
+            
+        Returns:
+            Tuple of status code and error text (empty on success)
+        """
+        extra_data = token_data.extra_data if token_data is not None else None
+        if extra_data:
+            conditional = {
+                request_header: extra_data[field]
+                for _, request_header, field in PROBE_VALIDATORS
+                if extra_data.get(field)
+            }
+            if conditional:
+                headers = {**headers, **conditional}
+        
+        # The limit is taken per attempt, so backoff sleeps don't hold a slot
+        status_code, error_body, response_headers = await self.http_client.probe(
+            url,
+            headers=headers,
+            timeout=timeout,
+            max_error_bytes=ERROR_SNIPPET_BYTES,
+            limiter=self._validation_limit,
+        )
+        
+        if status_code == 304:
+            return 200, ""
+        if status_code == 200 and extra_data is not None:
+            for response_header, _, field in PROBE_VALIDATORS:
+                value = response_headers.get(response_header)
+                if value:
+                    extra_data[field] = value
+                else:
+                    extra_data.pop(field, None)
+        return status_code, error_body.decode(errors="replace")
+    
     def get_default_headers(self, token_data: TokenData) -> Dict[str, str]:
         """
         Get default headers for API requests.
@@ -268,18 +564,17 @@ class BaseAuthProvider(abc.ABC):
         Returns:
             Dictionary of headers
         """
-        headers = {
-            "Authorization": f"{token_data.token_type} {token_data.access_token}",
-            "Content-Type": "application/json",
-            "User-Agent": f"CLIProxyAPI-Python/1.0.0 ({self.provider_name})",
-        }
-        
-        # Add extra headers from config if available
-        provider_config = self.get_provider_config()
-        if provider_config and hasattr(provider_config[0], "headers") and provider_config[0].headers:
-            headers.update(provider_config[0].headers)
+        cache_key = (token_data.token_type, token_data.access_token)
+        headers = self._header_cache.get(cache_key)
+        if headers is None:
+            headers = {
+                "Authorization": f"{token_data.token_type} {token_data.access_token}",
+                **self._static_headers,
+            }
+            self._header_cache[cache_key] = headers
         
-        return headers
+        # Callers add their own headers, so hand out a copy
+        return dict(headers)
     
     async def make_authenticated_request(
         self,
@@ -3,12 +3,42 @@ Claude authentication provider.
 Supports API key authentication for Anthropic Claude.
 """
 
-import json
+import hashlib
 from datetime import datetime, timedelta
+from types import MappingProxyType
 from typing import Dict, Optional, Any, List
+from urllib.parse import urlencode
 import httpx
+import orjson
+from cachetools import LRUCache, TTLCache
 
-from .base import BaseAuthProvider, AuthResult, TokenData, TokenStatus, PKCECodes
+from .base import BaseAuthProvider, AuthResult, TokenData, TokenStatus, PKCECodes, HEADER_CACHE_SIZE, ABSOLUTE_URL_PREFIXES, ERROR_SNIPPET_BYTES
+
+
+ANTHROPIC_VERSION = "2023-06-01"
+
+# Built once; per-call dicts only add the key-specific entries
+_CLAUDE_PROBE_HEADERS = MappingProxyType({"anthropic-version": ANTHROPIC_VERSION})
+ANTHROPIC_BETA = "max-tokens-2024-07-15"
+_CLAUDE_API_HEADERS = MappingProxyType({
+    "Content-Type": "application/json",
+    # Enable beta features
+    "anthropic-beta": ANTHROPIC_BETA,
+})
+
+# Prompt cache lifetimes Anthropic accepts, in minutes
+PROMPT_CACHE_TTLS = {5: "5m", 60: "1h"}
+
+# Betas opted into only by requests that actually set a cache breakpoint;
+# the 1h lifetime additionally needs the extended TTL beta
+PROMPT_CACHE_BETAS = {
+    5: f"{ANTHROPIC_BETA},prompt-caching-2024-07-31",
+    60: f"{ANTHROPIC_BETA},prompt-caching-2024-07-31,extended-cache-ttl-2025-04-11",
+}
+
+# Completions above this temperature vary too much to be worth reusing
+RESPONSE_CACHE_MAX_TEMPERATURE = 0.2
+RESPONSE_CACHE_SIZE = 256
 
 
 class ClaudeAuth(BaseAuthProvider):
@@ -31,6 +61,24 @@ class ClaudeAuth(BaseAuthProvider):
         
         # Get provider-specific configuration
         self.provider_config = self.get_provider_config()
+        self._api_header_cache: LRUCache = LRUCache(maxsize=HEADER_CACHE_SIZE)
+        self._response_cache: Optional[TTLCache] = None
+        response_cache_ttl = getattr(config, "response_cache_ttl", 0)
+        if response_cache_ttl > 0:
+            self._response_cache = TTLCache(maxsize=RESPONSE_CACHE_SIZE, ttl=response_cache_ttl)
+        
+        # OAuth client settings don't change after startup
+        self._client_id = self._get_client_id()
+        self._client_secret = self._get_client_secret()
+        self._redirect_uri = self._get_redirect_uri()
+        
+        # The authorization URL only varies in per-request parameters
+        self._auth_url_prefix = self.auth_url + "?" + urlencode({
+            "client_id": self._client_id,
+            "redirect_uri": self._redirect_uri,
+            "response_type": "code",
+            "scope": "claude",
+        })
     
     async def authenticate(self, **kwargs) -> AuthResult:
         """
@@ -55,57 +103,35 @@ class ClaudeAuth(BaseAuthProvider):
                 provider=self.provider_name,
             )
         
+        # Skip the network probe if this key was validated recently
+        if self._is_validation_cached(api_key, base_url):
+            return AuthResult.success_result(
+                self._api_key_token(api_key, key_id, base_url), self.provider_name
+            )
+        
         # Validate API key by making a test request
         try:
-            # Try to get Claude version to validate the API key
-            test_url = f"{base_url}/v1/messages"
-            headers = {
-                "x-api-key": api_key,
-                "anthropic-version": "2023-06-01",
-                "Content-Type": "application/json",
-            }
+            # Listing models is a metadata call, so no inference quota is spent
+            test_url = f"{base_url}/v1/models"
+            headers = {**_CLAUDE_PROBE_HEADERS, "x-api-key": api_key}
             
-            # Create a minimal test request
-            test_data = {
-                "model": "claude-3-haiku-20240307",
-                "max_tokens": 1,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": "Hello"
-                    }
-                ]
-            }
-            
-            response = await self.http_client.post(
-                test_url,
-                headers=headers,
-                json=test_data,
-                timeout=10.0,
+            # Concurrent checks of the same key share a single request
+            status_code, error_text = await self._coalesce(
+                self._validation_cache_key(api_key, base_url),
+                lambda: self._probe_status(test_url, headers, timeout=10.0),
             )
             
-            # Claude returns 400 for invalid API keys, 200/429 for valid ones
-            if response.status_code in [200, 400, 429]:
-                # API key is valid (400 is for missing model access, 429 is rate limit)
-                token_data = TokenData(
-                    access_token=api_key,
-                    token_type="Bearer",
-                    issued_at=datetime.utcnow(),
-                    # Claude API keys don't expire (unless revoked)
-                    expires_at=None,
-                    extra_data={
-                        "key_id": key_id,
-                        "base_url": base_url,
-                        "validation_time": datetime.utcnow().isoformat(),
-                        "anthropic_version": "2023-06-01",
-                    },
+            if status_code == 200:
+                # API key is valid
+                self._remember_validation(api_key, base_url)
+                return AuthResult.success_result(
+                    self._api_key_token(api_key, key_id, base_url), self.provider_name
                 )
-                
-                return AuthResult.success_result(token_data, self.provider_name)
             else:
-                error_text = response.text[:200] if response.text else "Unknown error"
+                self._forget_validation(api_key, base_url)
+                error_text = error_text or "Unknown error"
                 return AuthResult.error_result(
-                    error=f"API key validation failed: {response.status_code} - {error_text}",
+                    error=f"API key validation failed: {status_code} - {error_text}",
                     error_code="api_key_validation_failed",
                     provider=self.provider_name,
                 )
@@ -123,6 +149,23 @@ class ClaudeAuth(BaseAuthProvider):
                 provider=self.provider_name,
             )
     
+    def _api_key_token(self, api_key: str, key_id: str, base_url: str) -> TokenData:
+        """Build the token record for a validated API key."""
+        now = datetime.utcnow()
+        return TokenData(
+            access_token=api_key,
+            token_type="Bearer",
+            issued_at=now,
+            # Claude API keys don't expire (unless revoked)
+            expires_at=None,
+            extra_data={
+                "key_id": key_id,
+                "base_url": base_url,
+                "validation_time": now.isoformat(),
+                "anthropic_version": ANTHROPIC_VERSION,
+            },
+        )
+    
     async def refresh_token(self, refresh_token: str) -> TokenData:
         """
         Refresh an expired access token.
@@ -161,42 +204,30 @@ class ClaudeAuth(BaseAuthProvider):
             return TokenStatus.INVALID
         
         # Check if token is expired (Claude API keys don't expire)
-        if token_data.is_expired():
+        if token_data.expires_at is not None and token_data.is_expired():
             return TokenStatus.EXPIRED
         
+        if self._is_validation_cached(api_key, base_url) or self.is_recently_validated(token_data):
+            return TokenStatus.VALID
+        
         # Validate API key by making a test request
         try:
-            test_url = f"{base_url}/v1/messages"
-            headers = {
-                "x-api-key": api_key,
-                "anthropic-version": "2023-06-01",
-                "Content-Type": "application/json",
-            }
+            test_url = f"{base_url}/v1/models"
+            headers = {**_CLAUDE_PROBE_HEADERS, "x-api-key": api_key}
             
-            # Create a minimal test request
-            test_data = {
-                "model": "claude-3-haiku-20240307",
-                "max_tokens": 1,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": "Hello"
-                    }
-                ]
-            }
-            
-            response = await self.http_client.post(
-                test_url,
-                headers=headers,
-                json=test_data,
-                timeout=5.0,
+            # Concurrent checks of the same key share a single request
+            status_code, error_text = await self._coalesce(
+                self._validation_cache_key(api_key, base_url),
+                lambda: self._probe_status(test_url, headers, timeout=5.0),
             )
             
-            if response.status_code in [200, 400, 429]:
-                # 200 = success, 400 = model not accessible, 429 = rate limit
-                # All indicate valid API key
+            if status_code == 200:
+                self._remember_validation(api_key, base_url)
+                if token_data.extra_data is not None:
+                    token_data.extra_data["validation_time"] = datetime.utcnow().isoformat()
                 return TokenStatus.VALID
-            elif response.status_code == 401:
+            elif status_code in (401, 403):
+                self._forget_validation(api_key, base_url)
                 return TokenStatus.INVALID
             else:
                 # Other errors might be temporary
@@ -228,24 +259,15 @@ class ClaudeAuth(BaseAuthProvider):
         pkce = self.create_pkce_codes()
         state = self.generate_state()
         
-        # Build authorization URL
-        auth_params = {
-            "client_id": self._get_client_id(),
-            "redirect_uri": self._get_redirect_uri(),
-            "response_type": "code",
-            "scope": "claude",
-            "state": state,
-            "code_challenge": pkce.code_challenge,
-            "code_challenge_method": "S256",
-        }
+        # Build authorization URL; state and challenge are already URL-safe
+        auth_url = (
+            f"{self._auth_url_prefix}&state={state}"
+            f"&code_challenge={pkce.code_challenge}&code_challenge_method=S256"
+        )
         
         # Add optional parameters
         if "login_hint" in kwargs:
-            auth_params["login_hint"] = kwargs["login_hint"]
-        
-        # Build URL
-        from urllib.parse import urlencode
-        auth_url = f"{self.auth_url}?{urlencode(auth_params)}"
+            auth_url += "&" + urlencode({"login_hint": kwargs["login_hint"]})
         
         return AuthResult.oauth_redirect(
             auth_url=auth_url,
@@ -269,43 +291,49 @@ class ClaudeAuth(BaseAuthProvider):
         try:
             # Exchange code for tokens
             token_data = {
-                "client_id": self._get_client_id(),
-                "client_secret": self._get_client_secret(),
+                "client_id": self._client_id,
+                "client_secret": self._client_secret,
                 "code": code,
                 "code_verifier": code_verifier,
                 "grant_type": "authorization_code",
-                "redirect_uri": self._get_redirect_uri(),
+                "redirect_uri": self._redirect_uri,
             }
             
+            # Encode the form once; retries resend the same bytes
             response = await self.http_client.post(
                 self.token_url,
-                data=token_data,
+                content=urlencode(token_data).encode("ascii"),
                 headers={"Content-Type": "application/x-www-form-urlencoded"},
             )
             
             if response.status_code != 200:
-                error_text = response.text[:200] if response.text else "Unknown error"
+                error_text = response.content[:ERROR_SNIPPET_BYTES].decode("utf-8", errors="replace") if response.content else "Unknown error"
                 return AuthResult.error_result(
                     error=f"Token exchange failed: {response.status_code} - {error_text}",
                     error_code="token_exchange_failed",
                     provider=self.provider_name,
                 )
             
-            token_response = response.json()
+            token_response = orjson.loads(response.content)
             
             # Create TokenData from response
+            now = datetime.utcnow()
             token_data = TokenData(
                 access_token=token_response["access_token"],
                 refresh_token=token_response.get("refresh_token"),
                 token_type=token_response.get("token_type", "Bearer"),
-                expires_at=datetime.utcnow() + timedelta(seconds=token_response.get("expires_in", 3600)),
-                issued_at=datetime.utcnow(),
+                expires_at=now + timedelta(seconds=token_response.get("expires_in", 3600)),
+                issued_at=now,
                 scope=token_response.get("scope"),
                 extra_data={
                     "id_token": token_response.get("id_token"),
                 },
             )
             
+            # A token the issuer just handed out is known-good, so the first
+            # validate_token call doesn't need another round-trip
+            self._remember_validation(token_data.access_token, self.base_url)
+            
             return AuthResult.success_result(token_data, self.provider_name)
             
         except Exception as e:
@@ -325,24 +353,26 @@ class ClaudeAuth(BaseAuthProvider):
         Returns:
             Dictionary of headers
         """
-        headers = super().get_default_headers(token_data)
-        
-        # Claude uses x-api-key header instead of Authorization
-        if "x-api-key" not in headers:
-            headers["x-api-key"] = token_data.access_token
-        
-        # Add Claude-specific headers
-        anthropic_version = "2023-06-01"
+        anthropic_version = ANTHROPIC_VERSION
         if token_data.extra_data and "anthropic_version" in token_data.extra_data:
             anthropic_version = token_data.extra_data["anthropic_version"]
         
-        headers.update({
-            "Content-Type": "application/json",
-            "anthropic-version": anthropic_version,
-            "anthropic-beta": "max-tokens-2024-07-15",  # Enable beta features
-        })
+        # The version is part of the key so a changed version rebuilds the entry
+        cache_key = (token_data.token_type, token_data.access_token, anthropic_version)
+        headers = self._api_header_cache.get(cache_key)
+        if headers is None:
+            headers = super().get_default_headers(token_data)
+            
+            # Claude uses x-api-key header instead of Authorization
+            if "x-api-key" not in headers:
+                headers["x-api-key"] = token_data.access_token
+            
+            # Add Claude-specific headers
+            headers.update(_CLAUDE_API_HEADERS)
+            headers["anthropic-version"] = anthropic_version
+            self._api_header_cache[cache_key] = headers
         
-        return headers
+        return dict(headers)
     
     def _get_client_id(self) -> str:
         """Get OAuth client ID from config."""
@@ -380,14 +410,12 @@ class ClaudeAuth(BaseAuthProvider):
         Returns:
             HTTP response
         """
-        # Get base URL from token data or use default
-        base_url = self.base_url
-        if token_data.extra_data and "base_url" in token_data.extra_data:
-            base_url = token_data.extra_data["base_url"]
-        
-        # Ensure URL is absolute
-        if not url.startswith("http"):
-            url = f"{base_url}{url}"
+        # Ensure URL is absolute, using the token's base URL or the default
+        if not url.startswith(ABSOLUTE_URL_PREFIXES):
+            base_url = self.base_url
+            if token_data.extra_data and "base_url" in token_data.extra_data:
+                base_url = token_data.extra_data["base_url"]
+            url = base_url + url
         
         return await super().make_authenticated_request(method, url, token_data, **kwargs)
     
@@ -396,6 +424,7 @@ class ClaudeAuth(BaseAuthProvider):
         token_data: TokenData,
         model: str,
         messages: List[Dict[str, Any]],
+        cache_ttl: Optional[int] = None,
         **kwargs
     ) -> Dict[str, Any]:
         """
@@ -405,6 +434,8 @@ class ClaudeAuth(BaseAuthProvider):
             token_data: Token data for authentication
             model: Model to use
             messages: List of message dictionaries
+            cache_ttl: Minutes (5 or 60) to cache the prompt prefix server-side,
+                or None to disable prompt caching
             **kwargs: Additional parameters for message creation
             
         Returns:
@@ -412,17 +443,105 @@ class ClaudeAuth(BaseAuthProvider):
         """
         url = "/v1/messages"
         
+        headers: Dict[str, str] = {}
+        if cache_ttl is not None:
+            messages = self._mark_cache_breakpoint(messages, cache_ttl)
+            headers = {"anthropic-beta": PROMPT_CACHE_BETAS[cache_ttl]}
+        
         data = {
             "model": model,
             "messages": messages,
             **kwargs,
         }
+        body = orjson.dumps(data)
+        
+        # Identical deterministic requests can reuse a recent response
+        response_key = self._response_cache_key(token_data, body, kwargs)
+        if response_key:
+            cached = self._response_cache.get(response_key)
+            if cached is not None:
+                return orjson.loads(cached)
         
         response = await self.make_authenticated_request(
             method="POST",
             url=url,
             token_data=token_data,
-            json=data,
+            content=body,
+            headers=headers,
         )
         
-        return response.json()
+        if response_key and response.status_code == 200:
+            self._response_cache[response_key] = response.content
+        
+        return orjson.loads(response.content)
+    
+    def _response_cache_key(
+        self,
+        token_data: TokenData,
+        body: bytes,
+        params: Dict[str, Any],
+    ) -> Optional[str]:
+        """
+        Get the response cache key for a message request.
+        
+        Args:
+            token_data: Token data the request is made with
+            body: Serialized request body
+            params: Extra message parameters passed by the caller
+            
+        Returns:
+            Cache key, or None if the request must not be served from cache
+        """
+        if self._response_cache is None:
+            return None
+        if params.get("stream") or params.get("tools"):
+            return None
+        # The API default temperature is 1.0 (also when passed as None)
+        temperature = params.get("temperature")
+        if temperature is None:
+            temperature = 1.0
+        # Leave malformed values for the API to reject; just don't cache
+        if not isinstance(temperature, (int, float)) or temperature > RESPONSE_CACHE_MAX_TEMPERATURE:
+            return None
+        
+        # Namespace by the credential itself so cached completions never
+        # cross tenants (key_id is only a display prefix shared by many keys)
+        return hashlib.sha256(token_data.access_token.encode() + b"\0" + body).hexdigest()
+    
+    @staticmethod
+    def _mark_cache_breakpoint(
+        messages: List[Dict[str, Any]],
+        cache_ttl: int,
+    ) -> List[Dict[str, Any]]:
+        """
+        Mark the end of the reusable prompt prefix for Anthropic prompt caching.
+        
+        Everything before the final message is treated as the static prefix,
+        so its last message gets the cache_control breakpoint.
+        
+        Args:
+            messages: List of message dictionaries
+            cache_ttl: Cache lifetime in minutes (5 or 60)
+            
+        Returns:
+            Messages with the breakpoint applied (the input is not modified)
+        """
+        if cache_ttl not in PROMPT_CACHE_TTLS:
+            raise ValueError(f"cache_ttl must be one of {sorted(PROMPT_CACHE_TTLS)}, got {cache_ttl}")
+        
+        if len(messages) < 2:
+            return messages
+        
+        cache_control = {"type": "ephemeral", "ttl": PROMPT_CACHE_TTLS[cache_ttl]}
+        prefix_end = dict(messages[-2])
+        content = prefix_end.get("content")
+        if isinstance(content, str):
+            prefix_end["content"] = [
+                {"type": "text", "text": content, "cache_control": cache_control}
+            ]
+        elif isinstance(content, list) and content:
+            prefix_end["content"] = content[:-1] + [{**content[-1], "cache_control": cache_control}]
+        else:
+            return messages
+        
+        return messages[:-2] + [prefix_end, messages[-1]]
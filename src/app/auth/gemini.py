@@ -3,12 +3,18 @@ Gemini authentication provider.
 Supports API key authentication for Google Gemini.
 """
 
-import json
 from datetime import datetime, timedelta
+from types import MappingProxyType
 from typing import Dict, Optional, Any
+from urllib.parse import urlencode
 import httpx
+import orjson
 
-from .base import BaseAuthProvider, AuthResult, TokenData, TokenStatus, PKCECodes
+from .base import BaseAuthProvider, AuthResult, TokenData, TokenStatus, PKCECodes, ABSOLUTE_URL_PREFIXES, ERROR_SNIPPET_BYTES
+
+
+# Built once; per-call dicts only add the key-specific entries
+_GEMINI_BASE_HEADERS = MappingProxyType({"Content-Type": "application/json"})
 
 
 class GeminiAuth(BaseAuthProvider):
@@ -31,6 +37,21 @@ class GeminiAuth(BaseAuthProvider):
         
         # Get provider-specific configuration
         self.provider_config = self.get_provider_config()
+        
+        # OAuth client settings don't change after startup
+        self._client_id = self._get_client_id()
+        self._client_secret = self._get_client_secret()
+        self._redirect_uri = self._get_redirect_uri()
+        
+        # The authorization URL only varies in per-request parameters
+        self._auth_url_prefix = self.auth_url + "?" + urlencode({
+            "client_id": self._client_id,
+            "redirect_uri": self._redirect_uri,
+            "response_type": "code",
+            "scope": "https://www.googleapis.com/auth/cloud-platform",
+            "access_type": "offline",
+            "prompt": "consent",
+        })
     
     async def authenticate(self, **kwargs) -> AuthResult:
         """
@@ -53,40 +74,35 @@ class GeminiAuth(BaseAuthProvider):
                 provider=self.provider_name,
             )
         
+        # Skip the network probe if this key was validated recently
+        if self._is_validation_cached(api_key, self.base_url):
+            return AuthResult.success_result(
+                self._api_key_token(api_key, key_id), self.provider_name
+            )
+        
         # Validate API key by making a test request
         try:
             # Try to list models to validate the API key
             test_url = f"{self.base_url}/v1beta/models"
-            headers = {
-                "Content-Type": "application/json",
-                "x-goog-api-key": api_key,
-            }
+            headers = {**_GEMINI_BASE_HEADERS, "x-goog-api-key": api_key}
             
-            response = await self.http_client.get(
-                test_url,
-                headers=headers,
-                timeout=10.0,
+            # Concurrent checks of the same key share a single request
+            status_code, error_text = await self._coalesce(
+                self._validation_cache_key(api_key, self.base_url),
+                lambda: self._probe_status(test_url, headers, timeout=10.0),
             )
             
-            if response.status_code == 200:
+            if status_code == 200:
                 # API key is valid
-                token_data = TokenData(
-                    access_token=api_key,
-                    token_type="Bearer",
-                    issued_at=datetime.utcnow(),
-                    # API keys don't expire
-                    expires_at=None,
-                    extra_data={
-                        "key_id": key_id,
-                        "validation_time": datetime.utcnow().isoformat(),
-                    },
+                self._remember_validation(api_key, self.base_url)
+                return AuthResult.success_result(
+                    self._api_key_token(api_key, key_id), self.provider_name
                 )
-                
-                return AuthResult.success_result(token_data, self.provider_name)
             else:
-                error_text = response.text[:200] if response.text else "Unknown error"
+                self._forget_validation(api_key, self.base_url)
+                error_text = error_text or "Unknown error"
                 return AuthResult.error_result(
-                    error=f"API key validation failed: {response.status_code} - {error_text}",
+                    error=f"API key validation failed: {status_code} - {error_text}",
                     error_code="api_key_validation_failed",
                     provider=self.provider_name,
                 )
@@ -104,6 +120,21 @@ class GeminiAuth(BaseAuthProvider):
                 provider=self.provider_name,
             )
     
+    def _api_key_token(self, api_key: str, key_id: str) -> TokenData:
+        """Build the token record for a validated API key."""
+        now = datetime.utcnow()
+        return TokenData(
+            access_token=api_key,
+            token_type="Bearer",
+            issued_at=now,
+            # API keys don't expire
+            expires_at=None,
+            extra_data={
+                "key_id": key_id,
+                "validation_time": now.isoformat(),
+            },
+        )
+    
     async def refresh_token(self, refresh_token: str) -> TokenData:
         """
         Refresh an expired access token.
@@ -141,26 +172,30 @@ class GeminiAuth(BaseAuthProvider):
             return TokenStatus.INVALID
         
         # Check if token is expired (Gemini API keys don't expire)
-        if token_data.is_expired():
+        if token_data.expires_at is not None and token_data.is_expired():
             return TokenStatus.EXPIRED
         
+        if self._is_validation_cached(api_key, self.base_url) or self.is_recently_validated(token_data):
+            return TokenStatus.VALID
+        
         # Validate API key by making a test request
         try:
             test_url = f"{self.base_url}/v1beta/models"
-            headers = {
-                "Content-Type": "application/json",
-                "x-goog-api-key": api_key,
-            }
+            headers = {**_GEMINI_BASE_HEADERS, "x-goog-api-key": api_key}
             
-            response = await self.http_client.get(
-                test_url,
-                headers=headers,
-                timeout=5.0,
+            # Concurrent checks of the same key share a single request
+            status_code, error_text = await self._coalesce(
+                self._validation_cache_key(api_key, self.base_url),
+                lambda: self._probe_status(test_url, headers, timeout=5.0),
             )
             
-            if response.status_code == 200:
+            if status_code == 200:
+                self._remember_validation(api_key, self.base_url)
+                if token_data.extra_data is not None:
+                    token_data.extra_data["validation_time"] = datetime.utcnow().isoformat()
                 return TokenStatus.VALID
-            elif response.status_code == 403:
+            elif status_code in (401, 403):
+                self._forget_validation(api_key, self.base_url)
                 return TokenStatus.INVALID
             else:
                 # Other errors might be temporary
@@ -192,26 +227,15 @@ class GeminiAuth(BaseAuthProvider):
         pkce = self.create_pkce_codes()
         state = self.generate_state()
         
-        # Build authorization URL
-        auth_params = {
-            "client_id": self._get_client_id(),
-            "redirect_uri": self._get_redirect_uri(),
-            "response_type": "code",
-            "scope": "https://www.googleapis.com/auth/cloud-platform",
-            "state": state,
-            "code_challenge": pkce.code_challenge,
-            "code_challenge_method": "S256",
-            "access_type": "offline",
-            "prompt": "consent",
-        }
+        # Build authorization URL; state and challenge are already URL-safe
+        auth_url = (
+            f"{self._auth_url_prefix}&state={state}"
+            f"&code_challenge={pkce.code_challenge}&code_challenge_method=S256"
+        )
         
         # Add optional parameters
         if "login_hint" in kwargs:
-            auth_params["login_hint"] = kwargs["login_hint"]
-        
-        # Build URL
-        from urllib.parse import urlencode
-        auth_url = f"{self.auth_url}?{urlencode(auth_params)}"
+            auth_url += "&" + urlencode({"login_hint": kwargs["login_hint"]})
         
         return AuthResult.oauth_redirect(
             auth_url=auth_url,
@@ -235,43 +259,49 @@ class GeminiAuth(BaseAuthProvider):
         try:
             # Exchange code for tokens
             token_data = {
-                "client_id": self._get_client_id(),
-                "client_secret": self._get_client_secret(),
+                "client_id": self._client_id,
+                "client_secret": self._client_secret,
                 "code": code,
                 "code_verifier": code_verifier,
                 "grant_type": "authorization_code",
-                "redirect_uri": self._get_redirect_uri(),
+                "redirect_uri": self._redirect_uri,
             }
             
+            # Encode the form once; retries resend the same bytes
             response = await self.http_client.post(
                 self.token_url,
-                data=token_data,
+                content=urlencode(token_data).encode("ascii"),
                 headers={"Content-Type": "application/x-www-form-urlencoded"},
             )
             
             if response.status_code != 200:
-                error_text = response.text[:200] if response.text else "Unknown error"
+                error_text = response.content[:ERROR_SNIPPET_BYTES].decode("utf-8", errors="replace") if response.content else "Unknown error"
                 return AuthResult.error_result(
                     error=f"Token exchange failed: {response.status_code} - {error_text}",
                     error_code="token_exchange_failed",
                     provider=self.provider_name,
                 )
             
-            token_response = response.json()
+            token_response = orjson.loads(response.content)
             
             # Create TokenData from response
+            now = datetime.utcnow()
             token_data = TokenData(
                 access_token=token_response["access_token"],
                 refresh_token=token_response.get("refresh_token"),
                 token_type=token_response.get("token_type", "Bearer"),
-                expires_at=datetime.utcnow() + timedelta(seconds=token_response.get("expires_in", 3600)),
-                issued_at=datetime.utcnow(),
+                expires_at=now + timedelta(seconds=token_response.get("expires_in", 3600)),
+                issued_at=now,
                 scope=token_response.get("scope"),
                 extra_data={
                     "id_token": token_response.get("id_token"),
                 },
             )
             
+            # A token the issuer just handed out is known-good, so the first
+            # validate_token call doesn't need another round-trip
+            self._remember_validation(token_data.access_token, self.base_url)
+            
             return AuthResult.success_result(token_data, self.provider_name)
             
         except Exception as e:
@@ -298,9 +328,7 @@ class GeminiAuth(BaseAuthProvider):
             headers["x-goog-api-key"] = token_data.access_token
         
         # Add Gemini-specific headers
-        headers.update({
-            "Content-Type": "application/json",
-        })
+        headers.update(_GEMINI_BASE_HEADERS)
         
         return headers
     
@@ -341,7 +369,7 @@ class GeminiAuth(BaseAuthProvider):
             HTTP response
         """
         # Ensure URL is absolute
-        if not url.startswith("http"):
-            url = f"{self.base_url}{url}"
+        if not url.startswith(ABSOLUTE_URL_PREFIXES):
+            url = self.base_url + url
         
         return await super().make_authenticated_request(method, url, token_data, **kwargs)
@@ -3,12 +3,26 @@ iFlow authentication provider.
 Supports cookie-based authentication for iFlow.
 """
 
-import json
+import hashlib
+import re
 from datetime import datetime, timedelta
 from typing import Dict, Optional, Any
 import httpx
+import orjson
+from cachetools import LRUCache, TTLCache
 
-from .base import BaseAuthProvider, AuthResult, TokenData, TokenStatus
+from .base import BaseAuthProvider, AuthResult, TokenData, TokenStatus, HEADER_CACHE_SIZE, ABSOLUTE_URL_PREFIXES
+
+
+# Cookie sessions typically expire after a week; unparseable ones get a day
+SESSION_TTL = timedelta(days=7)
+FALLBACK_SESSION_TTL = timedelta(days=1)
+
+# Parsed /api/user/info bodies kept per session, expiring with the validation TTL
+USER_INFO_CACHE_SIZE = 512
+
+# One "name=value" pair of a Cookie header, surrounding whitespace excluded
+_COOKIE_PAIR_RE = re.compile(r"(?:^|;)\s*([^;=]*?)\s*=\s*([^;]*?)\s*(?=;|$)")
 
 
 class iFlowAuth(BaseAuthProvider):
@@ -26,6 +40,12 @@ class iFlowAuth(BaseAuthProvider):
         
         # iFlow API endpoints
         self.base_url = "https://iflow.team"
+        self._user_info_url = f"{self.base_url}/api/user/info"
+        self._api_header_cache: LRUCache = LRUCache(maxsize=HEADER_CACHE_SIZE)
+        self._user_info_cache: TTLCache = TTLCache(
+            maxsize=USER_INFO_CACHE_SIZE,
+            ttl=getattr(config, "api_key_validation_ttl", 0),
+        )
         
         # Get provider-specific configuration
         self.provider_config = self.get_provider_config()
@@ -59,43 +79,43 @@ class iFlowAuth(BaseAuthProvider):
         
         # Validate cookies by making a test request
         try:
-            # Try to access user info to validate cookies
-            test_url = f"{self.base_url}/api/user/info"
-            
-            # Create cookie header
-            cookie_header = "; ".join([f"{k}={v}" for k, v in cookies.items()])
+            # Build the cookie header once; it is kept on the token for reuse
+            cookie_header = self._build_cookie_header(cookies)
             
             headers = {
                 "Cookie": cookie_header,
                 "Content-Type": "application/json",
             }
             
-            response = await self.http_client.get(
-                test_url,
-                headers=headers,
-                timeout=10.0,
+            # Try to access user info to validate cookies; concurrent checks
+            # of the same session share a single request
+            status_code, error_text = await self._coalesce(
+                self._validation_cache_key(cookie_header, self.base_url),
+                lambda: self._probe_status(self._user_info_url, headers, timeout=10.0),
             )
             
-            if response.status_code == 200:
+            if status_code == 200:
                 # Cookies are valid
+                now = datetime.utcnow()
                 token_data = TokenData(
-                    access_token=json.dumps(cookies),  # Store cookies as JSON string
+                    # The cookies live in extra_data; the token is just an opaque session id
+                    access_token=self._session_id(cookies),
                     token_type="Cookie",
-                    issued_at=datetime.utcnow(),
-                    # Cookie sessions typically expire
-                    expires_at=datetime.utcnow() + timedelta(days=7),
+                    issued_at=now,
+                    expires_at=now + SESSION_TTL,
                     extra_data={
                         "key_id": key_id,
-                        "validation_time": datetime.utcnow().isoformat(),
+                        "validation_time": now.isoformat(),
                         "cookies": cookies,
+                        "cookie_header": cookie_header,
                     },
                 )
+                self._remember_validation(token_data.access_token, self.base_url)
                 
                 return AuthResult.success_result(token_data, self.provider_name)
             else:
-                error_text = response.text[:200] if response.text else "Unknown error"
                 return AuthResult.error_result(
-                    error=f"Cookie validation failed: {response.status_code} - {error_text}",
+                    error=f"Cookie validation failed: {status_code} - {error_text or 'Unknown error'}",
                     error_code="cookie_validation_failed",
                     provider=self.provider_name,
                 )
@@ -125,28 +145,30 @@ class iFlowAuth(BaseAuthProvider):
         """
         # For iFlow, we need to re-authenticate with cookies
         # This is a simplified implementation
+        now = datetime.utcnow()
         try:
             # Parse cookies from refresh_token (which is JSON string)
-            cookies = json.loads(refresh_token)
+            cookies = orjson.loads(refresh_token)
             
             # Create new token data
             return TokenData(
-                access_token=refresh_token,
+                access_token=self._session_id(cookies),
                 token_type="Cookie",
-                issued_at=datetime.utcnow(),
-                expires_at=datetime.utcnow() + timedelta(days=7),
+                issued_at=now,
+                expires_at=now + SESSION_TTL,
                 extra_data={
                     "cookies": cookies,
-                    "refreshed_at": datetime.utcnow().isoformat(),
+                    "cookie_header": self._build_cookie_header(cookies),
+                    "refreshed_at": now.isoformat(),
                 },
             )
-        except:
+        except (ValueError, TypeError, AttributeError):
             # If we can't parse, return a basic token
             return TokenData(
                 access_token=refresh_token,
                 token_type="Cookie",
-                issued_at=datetime.utcnow(),
-                expires_at=datetime.utcnow() + timedelta(days=1),
+                issued_at=now,
+                expires_at=now + FALLBACK_SESSION_TTL,
             )
     
     async def validate_token(self, token_data: TokenData) -> TokenStatus:
@@ -166,28 +188,32 @@ class iFlowAuth(BaseAuthProvider):
         if token_data.is_expired():
             return TokenStatus.EXPIRED
         
+        if self._is_validation_cached(token_data.access_token, self.base_url):
+            return TokenStatus.VALID
+        
         # Try to parse cookies
         try:
-            cookies = json.loads(token_data.access_token)
-            
-            # Validate cookies by making a test request
-            test_url = f"{self.base_url}/api/user/info"
-            cookie_header = "; ".join([f"{k}={v}" for k, v in cookies.items()])
+            cookie_header = self._get_cookie_header(token_data)
             
             headers = {
                 "Cookie": cookie_header,
                 "Content-Type": "application/json",
             }
             
-            response = await self.http_client.get(
-                test_url,
-                headers=headers,
-                timeout=5.0,
+            # Validate cookies by making a test request; concurrent checks
+            # of the same session share a single request
+            status_code, _ = await self._coalesce(
+                self._validation_cache_key(cookie_header, self.base_url),
+                lambda: self._probe_status(self._user_info_url, headers, timeout=5.0),
             )
             
-            if response.status_code == 200:
+            if status_code == 200:
+                self._remember_validation(token_data.access_token, self.base_url)
+                if token_data.extra_data is not None:
+                    token_data.extra_data["validation_time"] = datetime.utcnow().isoformat()
                 return TokenStatus.VALID
-            elif response.status_code in [401, 403]:
+            elif status_code in [401, 403]:
+                self._forget_validation(token_data.access_token, self.base_url)
                 return TokenStatus.INVALID
             else:
                 return TokenStatus.REFRESH_NEEDED
@@ -195,6 +221,57 @@ class iFlowAuth(BaseAuthProvider):
         except Exception:
             return TokenStatus.REFRESH_NEEDED
     
+    async def get_user_info(self, token_data: TokenData) -> Optional[Dict[str, Any]]:
+        """
+        Get the iFlow user info for a session, reusing a recent response.
+        
+        Args:
+            token_data: Token data holding the session cookies
+            
+        Returns:
+            Parsed user info, or None if the session was rejected or the request failed
+        """
+        cookie_header = self._get_cookie_header(token_data)
+        cache_key = self._validation_cache_key(cookie_header, self.base_url)
+        user_info = self._user_info_cache.get(cache_key)
+        if user_info is not None:
+            return user_info
+        
+        try:
+            response = await self._coalesce(
+                f"user-info:{cache_key}",
+                lambda: self._fetch_user_info(cookie_header),
+            )
+        except Exception:
+            return None
+        
+        if response.status_code != 200:
+            if response.status_code in [401, 403]:
+                self._forget_validation(token_data.access_token, self.base_url)
+            return None
+        
+        try:
+            user_info = orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            return None
+        
+        # A full user info response also proves the session is valid
+        self._user_info_cache[cache_key] = user_info
+        self._remember_validation(token_data.access_token, self.base_url)
+        return user_info
+    
+    async def _fetch_user_info(self, cookie_header: str) -> httpx.Response:
+        """Request the user info endpoint with the given session cookies."""
+        return await self.http_client.get(
+            self._user_info_url,
+            headers={
+                "Cookie": cookie_header,
+                "Content-Type": "application/json",
+            },
+            timeout=10.0,
+            limiter=self._validation_limit,
+        )
+    
     def get_default_headers(self, token_data: TokenData) -> Dict[str, str]:
         """
         Get default headers for iFlow API requests.
@@ -205,20 +282,60 @@ class iFlowAuth(BaseAuthProvider):
         Returns:
             Dictionary of headers
         """
-        headers = super().get_default_headers(token_data)
-        
-        # Add iFlow-specific headers
-        headers.update({
-            "Content-Type": "application/json",
-        })
-        
         # Add cookies if available
+        cookie_header = None
         if token_data.extra_data and "cookies" in token_data.extra_data:
-            cookies = token_data.extra_data["cookies"]
-            cookie_header = "; ".join([f"{k}={v}" for k, v in cookies.items()])
-            headers["Cookie"] = cookie_header
+            cookie_header = self._get_cookie_header(token_data)
+        
+        # The access token is derived from the cookies, so new cookies get a new entry
+        cache_key = (token_data.token_type, token_data.access_token, cookie_header)
+        headers = self._api_header_cache.get(cache_key)
+        if headers is None:
+            headers = super().get_default_headers(token_data)
+            
+            # Add iFlow-specific headers
+            headers.update({
+                "Content-Type": "application/json",
+            })
+            
+            if cookie_header is not None:
+                headers["Cookie"] = cookie_header
+            self._api_header_cache[cache_key] = headers
         
-        return headers
+        return dict(headers)
+    
+    @staticmethod
+    def _session_id(cookies: Dict[str, str]) -> str:
+        """Derive a short stable identifier for a cookie session."""
+        serialized = orjson.dumps(cookies, option=orjson.OPT_SORT_KEYS)
+        return hashlib.blake2b(serialized, digest_size=16).hexdigest()
+    
+    @staticmethod
+    def _build_cookie_header(cookies: Dict[str, str]) -> str:
+        """Serialize cookies into a Cookie header value."""
+        return "; ".join(f"{k}={v}" for k, v in cookies.items())
+    
+    def _get_cookie_header(self, token_data: TokenData) -> str:
+        """
+        Get the Cookie header for a token, building it only if not stored yet.
+        
+        Tokens saved by older versions only carry the cookies as JSON in
+        access_token, so that is used as a fallback.
+        
+        Args:
+            token_data: Token data holding the session cookies
+            
+        Returns:
+            Cookie header value
+        """
+        extra_data = token_data.extra_data or {}
+        cookie_header = extra_data.get("cookie_header")
+        if cookie_header is None:
+            cookies = extra_data.get("cookies") or orjson.loads(token_data.access_token)
+            cookie_header = self._build_cookie_header(cookies)
+            if token_data.extra_data is not None:
+                token_data.extra_data["cookie_header"] = cookie_header
+        return cookie_header
     
     def _parse_cookie_string(self, cookie_string: str) -> Dict[str, str]:
         """
@@ -230,13 +347,7 @@ class iFlowAuth(BaseAuthProvider):
         Returns:
             Dictionary of cookies
         """
-        cookies = {}
-        for cookie in cookie_string.split(";"):
-            cookie = cookie.strip()
-            if "=" in cookie:
-                key, value = cookie.split("=", 1)
-                cookies[key.strip()] = value.strip()
-        return cookies
+        return dict(_COOKIE_PAIR_RE.findall(cookie_string))
     
     async def make_authenticated_request(
         self,
@@ -258,7 +369,7 @@ class iFlowAuth(BaseAuthProvider):
             HTTP response
         """
         # Ensure URL is absolute
-        if not url.startswith("http"):
-            url = f"{self.base_url}{url}"
+        if not url.startswith(ABSOLUTE_URL_PREFIXES):
+            url = self.base_url + url
         
         return await super().make_authenticated_request(method, url, token_data, **kwargs)
@@ -3,7 +3,10 @@ Authentication manager for CLI Proxy API.
 Manages authentication providers and token storage.
 """
 
-from typing import Dict, Optional, Any
+import asyncio
+from typing import Dict, Optional, Any, Tuple, Type
+import structlog
+
 from .base import BaseAuthProvider, AuthResult, TokenData, TokenStatus
 from .gemini import GeminiAuth
 from .openai import OpenAIAuth
@@ -11,6 +14,31 @@ from .claude import ClaudeAuth
 from .qwen import QwenAuth
 from .iflow import iFlowAuth
 from ..stores.manager import StoreManager
+from ..utils.http_client import get_http_client
+
+logger = structlog.get_logger(__name__)
+
+
+# Supported auth providers; instances are created on first use
+AUTH_PROVIDER_CLASSES: Dict[str, Type[BaseAuthProvider]] = {
+    "gemini": GeminiAuth,
+    "openai": OpenAIAuth,
+    "claude": ClaudeAuth,
+    "qwen": QwenAuth,
+    "iflow": iFlowAuth,
+}
+
+# Error code for lookups of a provider name that isn't registered
+PROVIDER_NOT_FOUND_CODE = "provider_not_found"
+
+
+def _provider_not_found(provider_name: str) -> AuthResult:
+    """Build the error result returned for an unknown provider name."""
+    return AuthResult.error_result(
+        error=f"Authentication provider not found: {provider_name}",
+        error_code=PROVIDER_NOT_FOUND_CODE,
+        provider=provider_name,
+    )
 
 
 class AuthManager:
@@ -23,22 +51,60 @@ class AuthManager:
         Args:
             config: Application configuration
             store_manager: Store manager for token storage
-            http_client: HTTP client for authentication requests
+            http_client: HTTP client for authentication requests (defaults to
+                the shared pooled client)
         """
         self.config = config
         self.store_manager = store_manager
-        self.http_client = http_client
+        self.http_client = http_client if http_client is not None else get_http_client(config)
         self.auth_providers: Dict[str, BaseAuthProvider] = {}
-        self._initialize_auth_providers()
+        
+        # Token writes kept off the request path, at most one chain per token
+        self._pending_saves: Dict[Tuple[str, str], asyncio.Task] = {}
+    
+    async def shutdown(self) -> None:
+        """Wait for background token writes to reach the store."""
+        if self._pending_saves:
+            await asyncio.wait(list(self._pending_saves.values()))
+    
+    def _save_in_background(self, provider_name: str, key_id: str, token_data: TokenData) -> None:
+        """
+        Schedule a token write without making the caller wait for it.
+        
+        Args:
+            provider_name: Provider name
+            key_id: Unique identifier for the token
+            token_data: Token data to save
+        """
+        key = (provider_name, key_id)
+        previous = self._pending_saves.get(key)
+        
+        async def save() -> None:
+            # Writes for the same token land in the order they were scheduled
+            if previous is not None:
+                await asyncio.wait([previous])
+            await self.store_manager.save_token(
+                provider=provider_name,
+                key_id=key_id,
+                token_data=token_data,
+            )
+        
+        task = asyncio.ensure_future(save())
+        self._pending_saves[key] = task
+        task.add_done_callback(lambda done: self._on_save_done(key, done))
+    
+    def _on_save_done(self, key: Tuple[str, str], task: asyncio.Task) -> None:
+        """Forget a finished background write and log it if it failed."""
+        if self._pending_saves.get(key) is task:
+            del self._pending_saves[key]
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Failed to save token {key[0]}/{key[1]}: {task.exception()}")
     
-    def _initialize_auth_providers(self):
-        """Initialize authentication providers."""
-        # Initialize all supported auth providers
-        self.auth_providers["gemini"] = GeminiAuth(self.config, self.http_client)
-        self.auth_providers["openai"] = OpenAIAuth(self.config, self.http_client)
-        self.auth_providers["claude"] = ClaudeAuth(self.config, self.http_client)
-        self.auth_providers["qwen"] = QwenAuth(self.config, self.http_client)
-        self.auth_providers["iflow"] = iFlowAuth(self.config, self.http_client)
+    async def _wait_for_pending_save(self, provider_name: str, key_id: str) -> None:
+        """Let a scheduled write for this token finish before it is read or deleted."""
+        task = self._pending_saves.get((provider_name, key_id))
+        if task is not None:
+            await asyncio.wait([task])
     
     def get_auth_provider(self, provider_name: str) -> Optional[BaseAuthProvider]:
         """
@@ -50,7 +116,23 @@ class AuthManager:
         Returns:
             Authentication provider, or None if not found
         """
-        return self.auth_providers.get(provider_name.lower())
+        # Callers almost always pass the canonical lowercase name already
+        auth_provider = self.auth_providers.get(provider_name)
+        if auth_provider is not None:
+            return auth_provider
+        
+        provider_name = provider_name.lower()
+        auth_provider = self.auth_providers.get(provider_name)
+        if auth_provider is None:
+            provider_class = AUTH_PROVIDER_CLASSES.get(provider_name)
+            if provider_class is None:
+                return None
+            
+            # Only providers that are actually used get constructed
+            auth_provider = provider_class(self.config, self.http_client)
+            self.auth_providers[provider_name] = auth_provider
+        
+        return auth_provider
     
     async def authenticate(
         self,
@@ -71,11 +153,7 @@ class AuthManager:
         """
         auth_provider = self.get_auth_provider(provider_name)
         if not auth_provider:
-            return AuthResult.error_result(
-                error=f"Authentication provider not found: {provider_name}",
-                error_code="provider_not_found",
-                provider=provider_name,
-            )
+            return _provider_not_found(provider_name)
         
         # Authenticate with provider
         auth_result = await auth_provider.authenticate(**kwargs)
@@ -112,6 +190,7 @@ class AuthManager:
             Token data, or None if not found or invalid
         """
         # Get token from store
+        await self._wait_for_pending_save(provider_name, key_id)
         token_data = await self.store_manager.get_token(provider_name, key_id)
         if not token_data:
             return None
@@ -119,8 +198,27 @@ class AuthManager:
         # Validate token if requested
         if validate:
             auth_provider = self.get_auth_provider(provider_name)
+            
+            # A token validated moments ago doesn't need another probe
+            if (
+                auth_provider
+                and not token_data.is_expired()
+                and auth_provider.is_recently_validated(token_data)
+            ):
+                return token_data
+            
             if auth_provider:
+                last_validated = (token_data.extra_data or {}).get("validation_time")
                 token_status = await auth_provider.validate_token(token_data)
+                
+                # Persist a refreshed validation stamp so it survives restarts;
+                # stamps only move once the previous one has aged out of the TTL
+                if (
+                    token_status == TokenStatus.VALID
+                    and (token_data.extra_data or {}).get("validation_time") != last_validated
+                ):
+                    self._save_in_background(provider_name, key_id, token_data)
+                
                 if token_status != TokenStatus.VALID:
                     # Token is invalid or expired
                     if token_status == TokenStatus.EXPIRED:
@@ -130,11 +228,7 @@ class AuthManager:
                                 new_token_data = await auth_provider.refresh_token(
                                     token_data.refresh_token
                                 )
-                                await self.store_manager.save_token(
-                                    provider=provider_name,
-                                    key_id=key_id,
-                                    token_data=new_token_data,
-                                )
+                                self._save_in_background(provider_name, key_id, new_token_data)
                                 return new_token_data
                             except Exception:
                                 # Refresh failed, delete token
@@ -191,6 +285,15 @@ class AuthManager:
         Returns:
             True if token was deleted
         """
+        await self._wait_for_pending_save(provider_name, key_id)
+        
+        # Don't keep trusting a removed token on the strength of a cached check
+        auth_provider = self.get_auth_provider(provider_name)
+        if auth_provider:
+            token_data = await self.store_manager.get_token(provider_name, key_id)
+            if token_data:
+                auth_provider.invalidate_token(token_data)
+        
         return await self.store_manager.delete_token(provider_name, key_id)
     
     async def list_tokens(
@@ -225,11 +328,7 @@ class AuthManager:
         """
         auth_provider = self.get_auth_provider(provider_name)
         if not auth_provider:
-            return AuthResult.error_result(
-                error=f"Authentication provider not found: {provider_name}",
-                error_code="provider_not_found",
-                provider=provider_name,
-            )
+            return _provider_not_found(provider_name)
         
         return await auth_provider.get_auth_url(**kwargs)
     
@@ -256,11 +355,7 @@ class AuthManager:
         """
         auth_provider = self.get_auth_provider(provider_name)
         if not auth_provider:
-            return AuthResult.error_result(
-                error=f"Authentication provider not found: {provider_name}",
-                error_code="provider_not_found",
-                provider=provider_name,
-            )
+            return _provider_not_found(provider_name)
         
         # Exchange code for tokens
         auth_result = await auth_provider.exchange_code(code, state, code_verifier)
@@ -294,22 +389,23 @@ class AuthManager:
         Returns:
             True if logout successful
         """
-        # Get token data
-        token_data = await self.get_token(provider_name, key_id, validate=False)
+        # Remove the token from the store, keeping it for the provider logout
+        await self._wait_for_pending_save(provider_name, key_id)
+        token_data = await self.store_manager.pop_token(provider_name, key_id)
         if not token_data:
             return False
         
         # Call provider logout if supported
         auth_provider = self.get_auth_provider(provider_name)
         if auth_provider:
+            auth_provider.invalidate_token(token_data)
             try:
                 await auth_provider.logout(token_data)
             except Exception:
-                # Logout might fail, but we still delete the token locally
+                # Logout might fail, but the token is already deleted locally
                 pass
         
-        # Delete token from store
-        return await self.delete_token(provider_name, key_id)
+        return True
     
     async def cleanup_expired_tokens(self) -> int:
         """
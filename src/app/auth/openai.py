@@ -3,12 +3,21 @@ OpenAI/Codex authentication provider.
 Supports API key authentication for OpenAI and compatible APIs.
 """
 
-import json
 from datetime import datetime, timedelta
-from typing import Dict, Optional, Any, List
+from types import MappingProxyType
+from typing import AsyncGenerator, Dict, Optional, Any, List
+from urllib.parse import quote_plus, urlencode
 import httpx
+import orjson
 
-from .base import BaseAuthProvider, AuthResult, TokenData, TokenStatus
+from .base import BaseAuthProvider, AuthResult, TokenData, TokenStatus, ABSOLUTE_URL_PREFIXES, ERROR_SNIPPET_BYTES
+
+
+# OpenAI-specific headers, identical for every request
+_OPENAI_API_HEADERS = MappingProxyType({
+    "Content-Type": "application/json",
+    "OpenAI-Beta": "assistants=v2",  # Enable assistants v2 API
+})
 
 
 class OpenAIAuth(BaseAuthProvider):
@@ -24,13 +33,30 @@ class OpenAIAuth(BaseAuthProvider):
         """
         super().__init__("openai", config, http_client)
         
+        # Folded into the base headers so the cached per-token dict already has them
+        self._static_headers.update(_OPENAI_API_HEADERS)
+        
         # OpenAI API endpoints
         self.base_url = "https://api.openai.com"
         self.auth_url = "https://auth.openai.com/oauth/authorize"
         self.token_url = "https://auth.openai.com/oauth/token"
+        self._models_url = f"{self.base_url}/v1/models"
         
         # Get provider-specific configuration
         self.provider_config = self.get_provider_config()
+        
+        # OAuth client settings don't change after startup
+        self._client_id = self._get_client_id()
+        self._client_secret = self._get_client_secret()
+        self._redirect_uri = self._get_redirect_uri()
+        
+        # The authorization URL only varies in per-request parameters
+        self._auth_url_prefix = self.auth_url + "?" + urlencode({
+            "client_id": self._client_id,
+            "redirect_uri": self._redirect_uri,
+            "response_type": "code",
+            "scope": "openai",
+        })
     
     async def authenticate(self, **kwargs) -> AuthResult:
         """
@@ -58,38 +84,40 @@ class OpenAIAuth(BaseAuthProvider):
         # Validate API key by making a test request
         try:
             # Try to list models to validate the API key
-            test_url = f"{base_url}/v1/models"
+            test_url = self._models_url if base_url == self.base_url else f"{base_url}/v1/models"
             headers = {
                 "Authorization": f"Bearer {api_key}",
                 "Content-Type": "application/json",
             }
             
-            response = await self.http_client.get(
-                test_url,
-                headers=headers,
-                timeout=10.0,
+            # Only the status matters; concurrent checks of the same key share a request
+            status_code, error_text = await self._coalesce(
+                self._validation_cache_key(api_key, base_url),
+                lambda: self._probe_status(test_url, headers, timeout=10.0),
             )
             
-            if response.status_code == 200:
+            if status_code == 200:
                 # API key is valid
+                now = datetime.utcnow()
                 token_data = TokenData(
                     access_token=api_key,
                     token_type="Bearer",
-                    issued_at=datetime.utcnow(),
+                    issued_at=now,
                     # OpenAI API keys don't expire (unless revoked)
                     expires_at=None,
                     extra_data={
                         "key_id": key_id,
                         "base_url": base_url,
-                        "validation_time": datetime.utcnow().isoformat(),
+                        "validation_time": now.isoformat(),
                     },
                 )
+                self._remember_validation(api_key, base_url)
                 
                 return AuthResult.success_result(token_data, self.provider_name)
             else:
-                error_text = response.text[:200] if response.text else "Unknown error"
+                error_text = error_text or "Unknown error"
                 return AuthResult.error_result(
-                    error=f"API key validation failed: {response.status_code} - {error_text}",
+                    error=f"API key validation failed: {status_code} - {error_text}",
                     error_code="api_key_validation_failed",
                     provider=self.provider_name,
                 )
@@ -148,23 +176,30 @@ class OpenAIAuth(BaseAuthProvider):
         if token_data.is_expired():
             return TokenStatus.EXPIRED
         
+        if self._is_validation_cached(api_key, base_url) or self.is_recently_validated(token_data):
+            return TokenStatus.VALID
+        
         # Validate API key by making a test request
         try:
-            test_url = f"{base_url}/v1/models"
+            test_url = self._models_url if base_url == self.base_url else f"{base_url}/v1/models"
             headers = {
                 "Authorization": f"Bearer {api_key}",
                 "Content-Type": "application/json",
             }
             
-            response = await self.http_client.get(
-                test_url,
-                headers=headers,
-                timeout=5.0,
+            # Concurrent checks of the same key share a single request
+            status_code, _ = await self._coalesce(
+                self._validation_cache_key(api_key, base_url),
+                lambda: self._probe_status(test_url, headers, timeout=5.0, token_data=token_data),
             )
             
-            if response.status_code == 200:
+            if status_code == 200:
+                self._remember_validation(api_key, base_url)
+                if token_data.extra_data is not None:
+                    token_data.extra_data["validation_time"] = datetime.utcnow().isoformat()
                 return TokenStatus.VALID
-            elif response.status_code == 401:
+            elif status_code == 401:
+                self._forget_validation(api_key, base_url)
                 return TokenStatus.INVALID
             else:
                 # Other errors might be temporary
@@ -195,22 +230,12 @@ class OpenAIAuth(BaseAuthProvider):
         # Generate state
         state = self.generate_state()
         
-        # Build authorization URL
-        auth_params = {
-            "client_id": self._get_client_id(),
-            "redirect_uri": self._get_redirect_uri(),
-            "response_type": "code",
-            "scope": "openai",
-            "state": state,
-        }
+        # Build authorization URL; state is already URL-safe
+        auth_url = f"{self._auth_url_prefix}&state={state}"
         
         # Add optional parameters
         if "login_hint" in kwargs:
-            auth_params["login_hint"] = kwargs["login_hint"]
-        
-        # Build URL
-        from urllib.parse import urlencode
-        auth_url = f"{self.auth_url}?{urlencode(auth_params)}"
+            auth_url += "&login_hint=" + quote_plus(kwargs["login_hint"])
         
         return AuthResult.oauth_redirect(
             auth_url=auth_url,
@@ -234,36 +259,40 @@ class OpenAIAuth(BaseAuthProvider):
         try:
             # Exchange code for tokens
             token_data = {
-                "client_id": self._get_client_id(),
-                "client_secret": self._get_client_secret(),
+                "client_id": self._client_id,
+                "client_secret": self._client_secret,
                 "code": code,
                 "grant_type": "authorization_code",
-                "redirect_uri": self._get_redirect_uri(),
+                "redirect_uri": self._redirect_uri,
             }
             
+            # Encode the form once; retries resend the same bytes
             response = await self.http_client.post(
                 self.token_url,
-                data=token_data,
+                content=urlencode(token_data).encode("ascii"),
                 headers={"Content-Type": "application/x-www-form-urlencoded"},
             )
             
+            # Decode the body only as far as each branch needs it
+            raw = response.content
             if response.status_code != 200:
-                error_text = response.text[:200] if response.text else "Unknown error"
+                error_text = raw[:ERROR_SNIPPET_BYTES].decode("utf-8", errors="replace") if raw else "Unknown error"
                 return AuthResult.error_result(
                     error=f"Token exchange failed: {response.status_code} - {error_text}",
                     error_code="token_exchange_failed",
                     provider=self.provider_name,
                 )
             
-            token_response = response.json()
+            token_response = orjson.loads(raw)
             
             # Create TokenData from response
+            now = datetime.utcnow()
             token_data = TokenData(
                 access_token=token_response["access_token"],
                 refresh_token=token_response.get("refresh_token"),
                 token_type=token_response.get("token_type", "Bearer"),
-                expires_at=datetime.utcnow() + timedelta(seconds=token_response.get("expires_in", 3600)),
-                issued_at=datetime.utcnow(),
+                expires_at=now + timedelta(seconds=token_response.get("expires_in", 3600)),
+                issued_at=now,
                 scope=token_response.get("scope"),
                 extra_data={
                     "id_token": token_response.get("id_token"),
@@ -279,26 +308,6 @@ class OpenAIAuth(BaseAuthProvider):
                 provider=self.provider_name,
             )
     
-    def get_default_headers(self, token_data: TokenData) -> Dict[str, str]:
-        """
-        Get default headers for OpenAI API requests.
-        
-        Args:
-            token_data: Token data to use for authentication
-            
-        Returns:
-            Dictionary of headers
-        """
-        headers = super().get_default_headers(token_data)
-        
-        # Add OpenAI-specific headers
-        headers.update({
-            "Content-Type": "application/json",
-            "OpenAI-Beta": "assistants=v2",  # Enable assistants v2 API
-        })
-        
-        return headers
-    
     def _get_client_id(self) -> str:
         """Get OAuth client ID from config."""
         # This would come from configuration
@@ -335,16 +344,18 @@ class OpenAIAuth(BaseAuthProvider):
         Returns:
             HTTP response
         """
-        # Get base URL from token data or use default
+        url = self._absolute_url(url, token_data)
+        return await super().make_authenticated_request(method, url, token_data, **kwargs)
+    
+    def _absolute_url(self, url: str, token_data: TokenData) -> str:
+        """Ensure URL is absolute, using the token's base URL or the default."""
+        if url.startswith(ABSOLUTE_URL_PREFIXES):
+            return url
+        
         base_url = self.base_url
         if token_data.extra_data and "base_url" in token_data.extra_data:
             base_url = token_data.extra_data["base_url"]
-        
-        # Ensure URL is absolute
-        if not url.startswith("http"):
-            url = f"{base_url}{url}"
-        
-        return await super().make_authenticated_request(method, url, token_data, **kwargs)
+        return base_url + url
     
     async def create_completion(
         self,
@@ -377,10 +388,10 @@ class OpenAIAuth(BaseAuthProvider):
             method="POST",
             url=url,
             token_data=token_data,
-            json=data,
+            content=orjson.dumps(data),
         )
         
-        return response.json()
+        return orjson.loads(response.content)
     
     async def create_chat_completion(
         self,
@@ -413,7 +424,59 @@ class OpenAIAuth(BaseAuthProvider):
             method="POST",
             url=url,
             token_data=token_data,
-            json=data,
+            content=orjson.dumps(data),
         )
         
-        return response.json()
+        return orjson.loads(response.content)
+    
+    async def stream_chat_completion(
+        self,
+        token_data: TokenData,
+        model: str,
+        messages: List[Dict[str, str]],
+        **kwargs
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Create a streaming chat completion using OpenAI API.
+        
+        Chunks are yielded as the server sends them, so callers see the first
+        token without waiting for the whole completion.
+        
+        Args:
+            token_data: Token data for authentication
+            model: Model to use
+            messages: List of message dictionaries
+            **kwargs: Additional parameters for chat completion
+            
+        Yields:
+            Parsed chat completion chunks
+        """
+        url = self._absolute_url("/v1/chat/completions", token_data)
+        
+        data = {
+            "model": model,
+            "messages": messages,
+            **kwargs,
+            "stream": True,
+        }
+        
+        async with self.http_client.stream(
+            "POST",
+            url,
+            headers=self.get_default_headers(token_data),
+            content=orjson.dumps(data),
+        ) as response:
+            if response.status_code != 200:
+                error_body = await response.aread()
+                error_text = error_body[:ERROR_SNIPPET_BYTES].decode("utf-8", errors="replace")
+                raise Exception(f"OpenAI API error: {response.status_code} - {error_text}")
+            
+            async for line in response.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                
+                payload = line[6:]  # Remove "data: " prefix
+                if payload == "[DONE]":
+                    break
+                
+                yield orjson.loads(payload)
@@ -3,12 +3,19 @@ Qwen authentication provider.
 Supports API key authentication for Alibaba Qwen.
 """
 
-import json
 from datetime import datetime, timedelta
+from types import MappingProxyType
 from typing import Dict, Optional, Any
 import httpx
 
-from .base import BaseAuthProvider, AuthResult, TokenData, TokenStatus
+from .base import BaseAuthProvider, AuthResult, TokenData, TokenStatus, ABSOLUTE_URL_PREFIXES
+
+
+# Qwen-specific headers, identical for every request
+_QWEN_API_HEADERS = MappingProxyType({
+    "Content-Type": "application/json",
+    "X-DashScope-SSE": "disable",  # Disable server-sent events by default
+})
 
 
 class QwenAuth(BaseAuthProvider):
@@ -24,8 +31,12 @@ class QwenAuth(BaseAuthProvider):
         """
         super().__init__("qwen", config, http_client)
         
+        # Folded into the base headers so the cached per-token dict already has them
+        self._static_headers.update(_QWEN_API_HEADERS)
+        
         # Qwen API endpoints
         self.base_url = "https://dashscope.aliyuncs.com"
+        self._models_url = f"{self.base_url}/api/v1/models"
         
         # Get provider-specific configuration
         self.provider_config = self.get_provider_config()
@@ -54,37 +65,38 @@ class QwenAuth(BaseAuthProvider):
         # Validate API key by making a test request
         try:
             # Try to list models to validate the API key
-            test_url = f"{self.base_url}/api/v1/models"
             headers = {
                 "Authorization": f"Bearer {api_key}",
                 "Content-Type": "application/json",
             }
             
-            response = await self.http_client.get(
-                test_url,
-                headers=headers,
-                timeout=10.0,
+            # Only the status matters; concurrent checks of the same key share a request
+            status_code, error_text = await self._coalesce(
+                self._validation_cache_key(api_key, self.base_url),
+                lambda: self._probe_status(self._models_url, headers, timeout=10.0),
             )
             
-            if response.status_code == 200:
+            if status_code == 200:
                 # API key is valid
+                now = datetime.utcnow()
                 token_data = TokenData(
                     access_token=api_key,
                     token_type="Bearer",
-                    issued_at=datetime.utcnow(),
+                    issued_at=now,
                     # Qwen API keys don't expire (unless revoked)
                     expires_at=None,
                     extra_data={
                         "key_id": key_id,
-                        "validation_time": datetime.utcnow().isoformat(),
+                        "validation_time": now.isoformat(),
                     },
                 )
+                self._remember_validation(api_key, self.base_url)
                 
                 return AuthResult.success_result(token_data, self.provider_name)
             else:
-                error_text = response.text[:200] if response.text else "Unknown error"
+                error_text = error_text or "Unknown error"
                 return AuthResult.error_result(
-                    error=f"API key validation failed: {response.status_code} - {error_text}",
+                    error=f"API key validation failed: {status_code} - {error_text}",
                     error_code="api_key_validation_failed",
                     provider=self.provider_name,
                 )
@@ -141,23 +153,29 @@ class QwenAuth(BaseAuthProvider):
         if token_data.is_expired():
             return TokenStatus.EXPIRED
         
+        if self._is_validation_cached(api_key, self.base_url) or self.is_recently_validated(token_data):
+            return TokenStatus.VALID
+        
         # Validate API key by making a test request
         try:
-            test_url = f"{self.base_url}/api/v1/models"
             headers = {
                 "Authorization": f"Bearer {api_key}",
                 "Content-Type": "application/json",
             }
             
-            response = await self.http_client.get(
-                test_url,
-                headers=headers,
-                timeout=5.0,
+            # Concurrent checks of the same key share a single request
+            status_code, _ = await self._coalesce(
+                self._validation_cache_key(api_key, self.base_url),
+                lambda: self._probe_status(self._models_url, headers, timeout=5.0, token_data=token_data),
             )
             
-            if response.status_code == 200:
+            if status_code == 200:
+                self._remember_validation(api_key, self.base_url)
+                if token_data.extra_data is not None:
+                    token_data.extra_data["validation_time"] = datetime.utcnow().isoformat()
                 return TokenStatus.VALID
-            elif response.status_code == 401:
+            elif status_code == 401:
+                self._forget_validation(api_key, self.base_url)
                 return TokenStatus.INVALID
             else:
                 return TokenStatus.REFRESH_NEEDED
@@ -165,26 +183,6 @@ class QwenAuth(BaseAuthProvider):
         except Exception:
             return TokenStatus.REFRESH_NEEDED
     
-    def get_default_headers(self, token_data: TokenData) -> Dict[str, str]:
-        """
-        Get default headers for Qwen API requests.
-        
-        Args:
-            token_data: Token data to use for authentication
-            
-        Returns:
-            Dictionary of headers
-        """
-        headers = super().get_default_headers(token_data)
-        
-        # Add Qwen-specific headers
-        headers.update({
-            "Content-Type": "application/json",
-            "X-DashScope-SSE": "disable",  # Disable server-sent events by default
-        })
-        
-        return headers
-    
     async def make_authenticated_request(
         self,
         method: str,
@@ -205,7 +203,7 @@ class QwenAuth(BaseAuthProvider):
             HTTP response
         """
         # Ensure URL is absolute
-        if not url.startswith("http"):
-            url = f"{self.base_url}{url}"
+        if not url.startswith(ABSOLUTE_URL_PREFIXES):
+            url = self.base_url + url
         
         return await super().make_authenticated_request(method, url, token_data, **kwargs)
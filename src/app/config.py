@@ -3,16 +3,97 @@ Configuration management for CLI Proxy API (Python implementation).
 Uses Pydantic for type-safe configuration with YAML file support.
 """
 
+import copy
 import os
 import sys
+from collections import OrderedDict
+from operator import attrgetter
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from enum import Enum
 
-from pydantic import BaseModel, Field, validator, root_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 import yaml
 
+# Prefer the libyaml-backed loader/dumper; fall back to pure Python if absent
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# Parsed YAML files keyed by resolved path -> (mtime_ns, size, data)
+YAML_CACHE_SIZE = 32
+_yaml_cache: "OrderedDict[str, Tuple[int, int, Dict[str, Any]]]" = OrderedDict()
+
+
+def _load_yaml_cached(path: Path) -> Dict[str, Any]:
+    """Load a YAML mapping, reusing the last parse while the file is unchanged.
+    
+    Args:
+        path: Path of the YAML file
+        
+    Returns:
+        A private copy of the parsed mapping (empty if the file is empty)
+    """
+    key = str(path.resolve())
+    stat = path.stat()
+    cached = _yaml_cache.get(key)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        _yaml_cache.move_to_end(key)
+        return copy.deepcopy(cached[2])
+    
+    with open(path, "r", encoding="utf-8") as f:
+        data = yaml.load(f, Loader=YAML_LOADER) or {}
+    
+    _yaml_cache[key] = (stat.st_mtime_ns, stat.st_size, data)
+    _yaml_cache.move_to_end(key)
+    if len(_yaml_cache) > YAML_CACHE_SIZE:
+        _yaml_cache.popitem(last=False)
+    return copy.deepcopy(data)
+
+
+# AppConfig field holding each provider's key list
+PROVIDER_CONFIG_GETTERS = {
+    "gemini": attrgetter("gemini_api_key"),
+    "codex": attrgetter("codex_api_key"),
+    "claude": attrgetter("claude_api_key"),
+    "openai": attrgetter("openai_compatibility"),
+    "vertex": attrgetter("vertex_api_key"),
+}
+
+
+# Validated AppConfig instances keyed by resolved path ->
+# (mtime_ns, size, settings environment fingerprint, config)
+_config_cache: Dict[str, Tuple[int, int, Tuple[Any, ...], "AppConfig"]] = {}
+
+
+def _settings_env_fingerprint(model_config: Dict[str, Any]) -> Tuple[Any, ...]:
+    """
+    Snapshot the environment inputs a settings class reads besides its YAML.
+    
+    Args:
+        model_config: The settings class's model_config
+        
+    Returns:
+        Hashable snapshot of the prefixed env vars and the env file(s)' stat
+    """
+    prefix = (model_config.get("env_prefix") or "").upper()
+    env = tuple(sorted(
+        (name, value) for name, value in os.environ.items()
+        if name.upper().startswith(prefix)
+    ))
+    
+    env_files = model_config.get("env_file") or ()
+    if isinstance(env_files, (str, Path)):
+        env_files = (env_files,)
+    files = []
+    for env_file in env_files:
+        try:
+            stat = os.stat(env_file)
+            files.append((os.path.abspath(env_file), stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            files.append((os.path.abspath(env_file), None, None))
+    return env, tuple(files)
+
 
 class TLSConfig(BaseModel):
     """TLS configuration for HTTPS."""
@@ -176,6 +257,23 @@ class AppConfig(BaseSettings):
     request_retry: int = Field(default=3, alias="request-retry")
     max_retry_interval: int = Field(default=30, alias="max-retry-interval")
     
+    # How long a successful API key validation is trusted before re-probing
+    api_key_validation_ttl: int = Field(default=300, alias="api-key-validation-ttl")
+    
+    # Upper bound on concurrent credential validation requests per provider (0 = unbounded)
+    max_concurrent_validations: int = Field(default=8, alias="max-concurrent-validations")
+    
+    # Seconds to reuse identical low-temperature Claude completions (0 disables)
+    response_cache_ttl: int = Field(default=0, alias="response-cache-ttl")
+    
+    # Streaming (SSE) write buffering
+    stream_flush_bytes: int = Field(default=4096, alias="stream-flush-bytes")
+    stream_flush_interval: float = Field(default=0.005, alias="stream-flush-interval")
+    
+    # Shared upstream connection pool size
+    http_max_connections: int = Field(default=64, alias="http-max-connections")
+    http_max_keepalive_connections: int = Field(default=32, alias="http-max-keepalive-connections")
+    
     # Quota management
     quota_exceeded: QuotaExceeded = Field(default_factory=QuotaExceeded)
     
@@ -216,47 +314,67 @@ class AppConfig(BaseSettings):
     # Internal fields
     disable_cooling: bool = Field(default=False, alias="disable-cooling")
     
-    @validator("auth_dir", pre=True)
+    @field_validator("auth_dir", mode="before")
+    @classmethod
     def expand_auth_dir(cls, v: str) -> str:
         """Expand ~ in auth directory path."""
         if v.startswith("~"):
             return os.path.expanduser(v)
         return v
     
-    @root_validator(pre=True)
-    def load_from_yaml_if_path(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+    @model_validator(mode="before")
+    @classmethod
+    def load_from_yaml_if_path(cls, values: Any) -> Any:
         """Load configuration from YAML file if config_file is provided."""
+        if not isinstance(values, dict):
+            return values
         config_file = values.get("config_file")
         if config_file and isinstance(config_file, str):
             config_path = Path(config_file)
             if config_path.exists():
-                with open(config_path, "r", encoding="utf-8") as f:
-                    yaml_config = yaml.safe_load(f)
-                    if yaml_config:
-                        # Merge YAML config with existing values
-                        # YAML values take precedence over existing values
-                        for key, value in yaml_config.items():
-                            if key not in values or values[key] is None:
-                                values[key] = value
+                yaml_config = _load_yaml_cached(config_path)
+                # Merge YAML config with existing values
+                # YAML values take precedence over existing values
+                for key, value in yaml_config.items():
+                    if key not in values or values[key] is None:
+                        values[key] = value
         return values
     
     @classmethod
     def from_file(cls, config_file: str) -> "AppConfig":
         """Load configuration from a YAML file."""
         config_path = Path(config_file)
-        if not config_path.exists():
-            raise FileNotFoundError(f"Config file not found: {config_file}")
+        try:
+            stat = config_path.stat()
+        except (FileNotFoundError, NotADirectoryError):
+            raise FileNotFoundError(f"Config file not found: {config_file}") from None
         
-        with open(config_path, "r", encoding="utf-8") as f:
-            yaml_config = yaml.safe_load(f)
+        # Unchanged file and environment: reuse the already-validated instance
+        key = str(config_path.resolve())
+        env_fingerprint = _settings_env_fingerprint(cls.model_config)
+        cached = _config_cache.get(key)
+        if (
+            cached
+            and cached[0] == stat.st_mtime_ns
+            and cached[1] == stat.st_size
+            and cached[2] == env_fingerprint
+            and type(cached[3]) is cls
+        ):
+            return cached[3].model_copy(deep=True)
         
-        if not yaml_config:
-            yaml_config = {}
+        yaml_config = _load_yaml_cached(config_path)
         
         # Add config_file to values for the validator
         yaml_config["config_file"] = config_file
         
-        return cls(**yaml_config)
+        config = cls(**yaml_config)
+        _config_cache[key] = (
+            stat.st_mtime_ns,
+            stat.st_size,
+            env_fingerprint,
+            config.model_copy(deep=True),
+        )
+        return config
     
     def save_to_file(self, config_file: str) -> None:
         """Save configuration to a YAML file."""
@@ -273,18 +391,12 @@ class AppConfig(BaseSettings):
         config_path.parent.mkdir(parents=True, exist_ok=True)
         
         with open(config_path, "w", encoding="utf-8") as f:
-            yaml.dump(config_dict, f, default_flow_style=False, sort_keys=False)
+            yaml.dump(config_dict, f, Dumper=YAML_DUMPER, default_flow_style=False, sort_keys=False)
     
     def get_provider_config(self, provider: str) -> List[Any]:
         """Get configuration for a specific provider."""
-        provider_map = {
-            "gemini": self.gemini_api_key,
-            "codex": self.codex_api_key,
-            "claude": self.claude_api_key,
-            "openai": self.openai_compatibility,
-            "vertex": self.vertex_api_key,
-        }
-        return provider_map.get(provider.lower(), [])
+        getter = PROVIDER_CONFIG_GETTERS.get(provider.lower())
+        return getter(self) if getter else []
     
     def validate_config(self) -> List[str]:
         """Validate configuration and return list of errors."""
@@ -314,6 +426,15 @@ class AppConfig(BaseSettings):
         return errors
 
 
+# Config file locations searched by load_config, in order
+CONFIG_LOCATIONS = (
+    "config.yaml",
+    "config/config.yaml",
+    "/app/config/config.yaml",
+    os.path.expanduser("~/.cli-proxy-api/config.yaml"),
+)
+
+
 # Global configuration instance
 _config: Optional[AppConfig] = None
 
@@ -334,17 +455,9 @@ def load_config(config_file: Optional[str] = None) -> AppConfig:
         _config = AppConfig.from_file(config_file)
     else:
         # Try to find config file in common locations
-        config_locations = [
-            "config.yaml",
-            "config/config.yaml",
-            "/app/config/config.yaml",
-            os.path.expanduser("~/.cli-proxy-api/config.yaml"),
-        ]
-        
-        for location in config_locations:
-            if Path(location).exists():
-                _config = AppConfig.from_file(location)
-                break
+        location = next((p for p in CONFIG_LOCATIONS if os.path.isfile(p)), None)
+        if location:
+            _config = AppConfig.from_file(location)
         else:
             # No config file found, use defaults
             _config = AppConfig()
@@ -363,4 +476,12 @@ def reload_config(config_file: Optional[str] = None) -> AppConfig:
     """Reload configuration from file."""
     global _config
     _config = None
+    # Force a fresh parse even if mtime/size look unchanged
+    if config_file:
+        key = str(Path(config_file).resolve())
+        _yaml_cache.pop(key, None)
+        _config_cache.pop(key, None)
+    else:
+        _yaml_cache.clear()
+        _config_cache.clear()
     return load_config(config_file)
@@ -3,20 +3,23 @@ Main FastAPI application for CLI Proxy API (Python implementation).
 """
 
 import asyncio
+import inspect
 import logging
 import os
+import time
 from contextlib import asynccontextmanager
 from typing import Dict, Any
 
 from fastapi import FastAPI, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 import structlog
 import uvicorn
 
 from .config import load_config, get_config
-from .utils.http_client import get_http_client
+from .utils.http_client import get_http_client, close_http_client
 from .api.routes import router as api_router
+from .auth.base import fill_pkce_pool
 from .auth.manager import AuthManager
 from .providers.registry import ProviderRegistry
 from .stores.manager import StoreManager
@@ -41,6 +44,8 @@ structlog.configure(
 )
 
 logger = structlog.get_logger(__name__)
+# Underlying stdlib logger; structlog's filter_by_level checks its level
+_stdlib_logger = logging.getLogger(__name__)
 
 
 # Global application state
@@ -53,6 +58,8 @@ class AppState:
         self.store_manager = None
         self.translator_registry = None
         self.http_client = None
+        self.pkce_pool_task = None
+        self.health_status = None
         self.is_shutting_down = False
 
 
@@ -92,9 +99,21 @@ async def lifespan(app: FastAPI):
         )
         await app_state.provider_registry.initialize()
         
+        # Streaming routes rely on providers yielding from true async
+        # generators; anything else would be offloaded to the threadpool
+        for name, provider in app_state.provider_registry.providers.items():
+            if not inspect.isasyncgenfunction(provider.chat_completion_stream):
+                raise TypeError(
+                    f"Provider {name} must implement chat_completion_stream "
+                    "as an async generator"
+                )
+        
         # Initialize translator registry
         app_state.translator_registry = TranslatorRegistry()
         
+        # Pre-generate PKCE codes in the background for OAuth flows
+        app_state.pkce_pool_task = asyncio.create_task(fill_pkce_pool())
+        
         # Set state on app for route access
         app.state.config = app_state.config
         app.state.auth_manager = app_state.auth_manager
@@ -102,6 +121,9 @@ async def lifespan(app: FastAPI):
         app.state.store_manager = app_state.store_manager
         app.state.translator_registry = app_state.translator_registry
         
+        # Services are fixed from here on, so /health can reuse one payload
+        app_state.health_status = _build_health_status()
+        
         logger.info("Application startup completed")
         yield
         
@@ -114,8 +136,16 @@ async def lifespan(app: FastAPI):
         logger.info("Shutting down CLI Proxy API")
         app_state.is_shutting_down = True
         
+        if app_state.pkce_pool_task:
+            app_state.pkce_pool_task.cancel()
+        
+        if app_state.auth_manager:
+            await app_state.auth_manager.shutdown()
+        
         if app_state.http_client:
-            await app_state.http_client.aclose()
+            # Also drops the global instance so a restarted app gets a fresh pool
+            await close_http_client()
+            app_state.http_client = None
         
         if app_state.store_manager:
             await app_state.store_manager.shutdown()
@@ -129,6 +159,7 @@ app = FastAPI(
     description="OpenAI/Gemini/Claude compatible API proxy for CLI tools",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs" if os.getenv("ENABLE_DOCS", "false").lower() == "true" else None,
     redoc_url="/redoc" if os.getenv("ENABLE_DOCS", "false").lower() == "true" else None,
 )
@@ -147,7 +178,7 @@ app.add_middleware(
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     """Log all incoming requests."""
-    start_time = asyncio.get_event_loop().time()
+    start_time = time.perf_counter()
     
     # Get request details
     request_id = request.headers.get("X-Request-ID", "unknown")
@@ -155,18 +186,24 @@ async def log_requests(request: Request, call_next):
     method = request.method
     path = request.url.path
     
-    logger.info(
-        "Request started",
-        request_id=request_id,
-        client_ip=client_ip,
-        method=method,
-        path=path,
-        query_params=dict(request.query_params),
-    )
+    if _stdlib_logger.isEnabledFor(logging.INFO):
+        # Raw query string by default; parsed params only when debugging
+        extra = {}
+        if _stdlib_logger.isEnabledFor(logging.DEBUG):
+            extra["query_params"] = dict(request.query_params)
+        logger.info(
+            "Request started",
+            request_id=request_id,
+            client_ip=client_ip,
+            method=method,
+            path=path,
+            query=request.url.query,
+            **extra,
+        )
     
     try:
         response = await call_next(request)
-        process_time = asyncio.get_event_loop().time() - start_time
+        process_time = time.perf_counter() - start_time
         
         logger.info(
             "Request completed",
@@ -182,7 +219,7 @@ async def log_requests(request: Request, call_next):
         return response
         
     except Exception as e:
-        process_time = asyncio.get_event_loop().time() - start_time
+        process_time = time.perf_counter() - start_time
         logger.error(
             "Request failed",
             request_id=request_id,
@@ -207,7 +244,7 @@ async def global_exception_handler(request: Request, exc: Exception):
         exc_info=True,
     )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "error": {
@@ -235,16 +272,9 @@ async def not_found_handler(request: Request, exc: Exception):
 
 
 # Health check endpoint
-@app.get("/health")
-async def health_check():
-    """Health check endpoint."""
-    if app_state.is_shutting_down:
-        return JSONResponse(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            content={"status": "shutting_down"},
-        )
-    
-    health_status = {
+def _build_health_status() -> Dict[str, Any]:
+    """Build the /health payload from the current application state."""
+    return {
         "status": "healthy",
         "version": "1.0.0",
         "services": {
@@ -255,8 +285,21 @@ async def health_check():
             "store": "healthy" if app_state.store_manager else "unhealthy",
         },
     }
+
+
+@app.get("/health")
+async def health_check():
+    """Health check endpoint."""
+    if app_state.is_shutting_down:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "shutting_down"},
+        )
+    
+    if app_state.health_status is not None:
+        return app_state.health_status
     
-    return health_status
+    return _build_health_status()
 
 
 @app.get("/")
@@ -3,11 +3,18 @@ Provider module for CLI Proxy API.
 Manages AI provider instances and load balancing.
 """
 
+import importlib
+from typing import Any
+
 from .base import BaseProvider, ProviderConfig
-from .gemini_provider import GeminiProvider
-from .openai_provider import OpenAIProvider
-from .claude_provider import ClaudeProvider
-from .registry import ProviderRegistry
+
+# Concrete providers are imported on first attribute access (PEP 562)
+_LAZY_IMPORTS = {
+    "GeminiProvider": ".gemini_provider",
+    "OpenAIProvider": ".openai_provider",
+    "ClaudeProvider": ".claude_provider",
+    "ProviderRegistry": ".registry",
+}
 
 __all__ = [
     "BaseProvider",
@@ -17,3 +24,18 @@ __all__ = [
     "ClaudeProvider",
     "ProviderRegistry",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import a provider class the first time it is requested."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    """Include the lazily imported names in dir()."""
+    return sorted(set(globals()) | set(__all__))
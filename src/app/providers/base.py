@@ -3,6 +3,7 @@ Base provider interface for AI service providers.
 """
 
 import abc
+import time
 from datetime import datetime
 from typing import Dict, List, Optional, Any, AsyncGenerator
 from dataclasses import dataclass
@@ -27,6 +28,10 @@ class ProviderStatus(Enum):
     OFFLINE = "offline"
 
 
+# Status by number of success-rate thresholds (80%, 95%) met
+_STATUS_BUCKETS = (ProviderStatus.UNHEALTHY, ProviderStatus.DEGRADED, ProviderStatus.HEALTHY)
+
+
 @dataclass
 class ProviderConfig:
     """Provider configuration."""
@@ -58,7 +63,7 @@ class ProviderConfig:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ProviderStats:
     """Provider statistics."""
     total_requests: int = 0
@@ -66,10 +71,24 @@ class ProviderStats:
     failed_requests: int = 0
     total_tokens: int = 0
     total_cost: float = 0.0
-    average_response_time: float = 0.0
-    last_request_time: Optional[datetime] = None
+    total_response_time: float = 0.0
+    last_request_time_ns: int = 0
     status: ProviderStatus = ProviderStatus.HEALTHY
     
+    @property
+    def average_response_time(self) -> float:
+        """Mean response time over all recorded requests."""
+        if self.total_requests == 0:
+            return 0.0
+        return self.total_response_time / self.total_requests
+    
+    @property
+    def last_request_time(self) -> Optional[datetime]:
+        """Time of the last recorded request (naive UTC), if any."""
+        if not self.last_request_time_ns:
+            return None
+        return datetime.utcfromtimestamp(self.last_request_time_ns / 1e9)
+    
     def success_rate(self) -> float:
         """Calculate success rate."""
         if self.total_requests == 0:
@@ -87,25 +106,14 @@ class ProviderStats:
         self.total_tokens += tokens
         self.total_cost += cost
         
-        # Update average response time
-        if self.total_requests == 1:
-            self.average_response_time = response_time
-        else:
-            self.average_response_time = (
-                (self.average_response_time * (self.total_requests - 1) + response_time) 
-                / self.total_requests
-            )
+        # Average response time is derived from the running total
+        self.total_response_time += response_time
         
-        self.last_request_time = datetime.utcnow()
+        self.last_request_time_ns = time.time_ns()
         
         # Update status based on success rate
         success_rate = self.success_rate()
-        if success_rate >= 95:
-            self.status = ProviderStatus.HEALTHY
-        elif success_rate >= 80:
-            self.status = ProviderStatus.DEGRADED
-        else:
-            self.status = ProviderStatus.UNHEALTHY
+        self.status = _STATUS_BUCKETS[(success_rate >= 80) + (success_rate >= 95)]
 
 
 class BaseProvider(abc.ABC):
@@ -124,6 +132,10 @@ class BaseProvider(abc.ABC):
         self.auth_manager = auth_manager
         self.http_client = http_client
         self.stats = ProviderStats()
+        
+        # Model prefix matched by the default can_handle_model
+        self._model_prefix = config.provider_type.value.lower()
+        self._model_prefix_len = len(self._model_prefix)
     
     def _set_status(self, status: ProviderStatus) -> None:
         """Set provider status."""
@@ -245,7 +257,7 @@ class BaseProvider(abc.ABC):
             True if provider can handle the model
         """
         # Default implementation checks if model starts with provider type
-        return model.lower().startswith(self.config.provider_type.value)
+        return model[:self._model_prefix_len].lower() == self._model_prefix
     
     def get_priority(self) -> int:
         """
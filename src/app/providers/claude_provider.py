@@ -8,6 +8,7 @@ from datetime import datetime
 
 from .base import BaseProvider, ProviderConfig, ProviderStatus
 from ..auth.manager import AuthManager
+from ..auth.base import ERROR_SNIPPET_BYTES
 from ..utils.http_client import HTTPClient
 
 
@@ -142,7 +143,7 @@ class ClaudeProvider(BaseProvider):
         )
         
         if response.status_code != 200:
-            raise Exception(f"Claude API error: {response.status_code} - {response.text}")
+            raise Exception(f"Claude API error: {response.status_code} - {response.content[:ERROR_SNIPPET_BYTES].decode('utf-8', errors='replace')}")
         
         result = response.json()
         
@@ -9,6 +9,7 @@ from datetime import datetime
 
 from .base import BaseProvider, ProviderConfig, ProviderStatus
 from ..auth.manager import AuthManager
+from ..auth.base import ERROR_SNIPPET_BYTES
 from ..utils.http_client import HTTPClient
 
 
@@ -219,7 +220,7 @@ class GeminiProvider(BaseProvider):
         )
         
         if response.status_code != 200:
-            raise Exception(f"Gemini API error: {response.status_code} - {response.text}")
+            raise Exception(f"Gemini API error: {response.status_code} - {response.content[:ERROR_SNIPPET_BYTES].decode('utf-8', errors='replace')}")
         
         result = response.json()
         
@@ -307,7 +308,7 @@ class GeminiProvider(BaseProvider):
             ) as response:
                 if response.status_code != 200:
                     error_text = await response.aread()
-                    raise Exception(f"Gemini API error: {response.status_code} - {error_text.decode()}")
+                    raise Exception(f"Gemini API error: {response.status_code} - {error_text[:ERROR_SNIPPET_BYTES].decode('utf-8', errors='replace')}")
                 
                 async for line in response.aiter_lines():
                     if not line or not line.startswith("data: "):
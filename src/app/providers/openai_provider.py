@@ -8,8 +8,13 @@ from datetime import datetime
 
 from .base import BaseProvider, ProviderConfig, ProviderStatus
 from ..auth.manager import AuthManager
+from ..auth.base import ERROR_SNIPPET_BYTES
 from ..utils.http_client import HTTPClient
 
+# OpenAI models typically start with "gpt-", "text-", "code-", etc.;
+# DeepSeek models start with "deepseek-"
+MODEL_PREFIXES = ("gpt-", "text-", "code-", "davinci-", "curie-", "babbage-", "ada-", "deepseek-")
+
 
 class OpenAIProvider(BaseProvider):
     """OpenAI AI provider implementation."""
@@ -72,13 +77,7 @@ class OpenAIProvider(BaseProvider):
         Returns:
             True if can handle, False otherwise
         """
-        # OpenAI models typically start with "gpt-", "text-", "code-", etc.
-        openai_prefixes = ["gpt-", "text-", "code-", "davinci-", "curie-", "babbage-", "ada-"]
-        # DeepSeek models start with "deepseek-"
-        deepseek_prefixes = ["deepseek-"]
-        
-        all_prefixes = openai_prefixes + deepseek_prefixes
-        return any(model.startswith(prefix) for prefix in all_prefixes)
+        return model.startswith(MODEL_PREFIXES)
     
     async def chat_completion(
         self,
@@ -121,7 +120,7 @@ class OpenAIProvider(BaseProvider):
         )
         
         if response.status_code != 200:
-            raise Exception(f"OpenAI API error: {response.status_code} - {response.text}")
+            raise Exception(f"OpenAI API error: {response.status_code} - {response.content[:ERROR_SNIPPET_BYTES].decode('utf-8', errors='replace')}")
         
         result = response.json()
         
@@ -3,9 +3,7 @@ Base storage interface for token management.
 """
 
 import abc
-from datetime import datetime
 from typing import Dict, List, Optional, Any
-from dataclasses import asdict
 
 from ..auth.base import TokenData
 
@@ -102,6 +100,30 @@ class BaseStore(abc.ABC):
         """
         pass
     
+    async def pop_token(
+        self,
+        provider: str,
+        key_id: str,
+    ) -> Optional[TokenData]:
+        """
+        Delete a token from store and return it.
+        
+        Stores that can read and delete in one operation should override this.
+        
+        Args:
+            provider: Provider name
+            key_id: Unique identifier for the token
+            
+        Returns:
+            The deleted TokenData, or None if not found
+        """
+        token_data = await self.get_token(provider, key_id)
+        if token_data is None:
+            return None
+        
+        await self.delete_token(provider, key_id)
+        return token_data
+    
     @abc.abstractmethod
     async def list_tokens(
         self,
@@ -195,20 +217,8 @@ class BaseStore(abc.ABC):
     
     def _serialize_token(self, token_data: TokenData) -> Dict[str, Any]:
         """Serialize token data for storage."""
-        serialized = asdict(token_data)
-        
-        # Convert datetime to ISO format string
-        for key in ["expires_at", "issued_at"]:
-            if serialized[key] and isinstance(serialized[key], datetime):
-                serialized[key] = serialized[key].isoformat()
-        
-        return serialized
+        return token_data.to_dict()
     
     def _deserialize_token(self, data: Dict[str, Any]) -> TokenData:
         """Deserialize token data from storage."""
-        # Convert ISO format strings back to datetime
-        for key in ["expires_at", "issued_at"]:
-            if key in data and data[key] and isinstance(data[key], str):
-                data[key] = datetime.fromisoformat(data[key].replace("Z", "+00:00"))
-        
-        return TokenData(**data)
+        return TokenData.from_dict(data)
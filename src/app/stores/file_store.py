@@ -4,18 +4,25 @@ Stores tokens as JSON files in a directory structure.
 """
 
 import asyncio
+import heapq
 import json
 import os
 import shutil
+import time
+import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import aiofiles
 import aiofiles.os
+import orjson
 
 from .base import BaseStore, StoreError, TokenNotFoundError
 from ..auth.base import TokenData
 
+# Stale expiry heap entries tolerated beyond one per tracked token before a rebuild
+EXPIRY_HEAP_SLACK = 64
+
 
 class FileStore(BaseStore):
     """File-based token storage."""
@@ -31,6 +38,13 @@ class FileStore(BaseStore):
         self.data_dir = Path(getattr(config, "auth_dir", "~/.cli-proxy-api")).expanduser()
         self.tokens_dir = self.data_dir / "tokens"
         self.metadata_dir = self.data_dir / "metadata"
+        
+        # Min-heap of (expires_ts, provider, key_id) so cleanup only touches expired tokens.
+        # Entries go stale when a token is re-saved or deleted; _expiry_index holds the
+        # current expiry per token, stale heap entries are skipped when popped, and the
+        # heap is rebuilt from the index once stale entries outnumber live ones.
+        self._expiry_heap: List[Tuple[float, str, str]] = []
+        self._expiry_index: Dict[Tuple[str, str], float] = {}
     
     async def initialize(self) -> None:
         """Initialize the file store."""
@@ -46,6 +60,49 @@ class FileStore(BaseStore):
             
             metadata_dir = self.metadata_dir / provider
             await aiofiles.os.makedirs(metadata_dir, exist_ok=True)
+        
+        await self._load_expiry_index()
+    
+    async def _load_expiry_index(self) -> None:
+        """Rebuild the expiry heap from the tokens already on disk."""
+        self._expiry_heap.clear()
+        self._expiry_index.clear()
+        
+        for provider_dir in self.tokens_dir.iterdir():
+            if not provider_dir.is_dir():
+                continue
+            for token_file in provider_dir.glob("*.json"):
+                try:
+                    token_data = await self.get_token(provider_dir.name, token_file.stem)
+                except StoreError:
+                    continue
+                if token_data:
+                    self._track_expiry(provider_dir.name, token_file.stem, token_data)
+    
+    def _track_expiry(self, provider: str, key_id: str, token_data: TokenData) -> None:
+        """Record a token's expiry in the heap, replacing any earlier entry."""
+        expires_ts = token_data.expires_ts
+        if expires_ts is None:
+            self._expiry_index.pop((provider, key_id), None)
+            self._compact_expiry_heap()
+            return
+        
+        if self._expiry_index.get((provider, key_id)) == expires_ts:
+            # Re-saved with the same expiry; the existing heap entry still holds
+            return
+        self._expiry_index[(provider, key_id)] = expires_ts
+        heapq.heappush(self._expiry_heap, (expires_ts, provider, key_id))
+        self._compact_expiry_heap()
+    
+    def _compact_expiry_heap(self) -> None:
+        """Rebuild the expiry heap from the index once stale entries dominate it."""
+        if len(self._expiry_heap) <= 2 * len(self._expiry_index) + EXPIRY_HEAP_SLACK:
+            return
+        self._expiry_heap = [
+            (expires_ts, provider, key_id)
+            for (provider, key_id), expires_ts in self._expiry_index.items()
+        ]
+        heapq.heapify(self._expiry_heap)
     
     async def shutdown(self) -> None:
         """Shutdown the file store."""
@@ -86,9 +143,14 @@ class FileStore(BaseStore):
         # Serialize token data
         serialized_token = self._serialize_token(token_data)
         
-        # Save token data
-        async with aiofiles.open(token_path, "w", encoding="utf-8") as f:
-            await f.write(json.dumps(serialized_token, indent=2))
+        # Save token data via a temp file so concurrent readers never see a
+        # half-written file (get_token deletes files that fail to parse)
+        tmp_path = token_path.with_name(f"{token_path.name}.{uuid.uuid4().hex}.tmp")
+        async with aiofiles.open(tmp_path, "wb") as f:
+            await f.write(orjson.dumps(serialized_token, option=orjson.OPT_INDENT_2))
+        await aiofiles.os.replace(tmp_path, token_path)
+        
+        self._track_expiry(provider, key_id, token_data)
         
         # Save metadata if provided
         if metadata is not None:
@@ -124,13 +186,12 @@ class FileStore(BaseStore):
             return None
         
         try:
-            async with aiofiles.open(token_path, "r", encoding="utf-8") as f:
-                content = await f.read()
-                data = json.loads(content)
+            async with aiofiles.open(token_path, "rb") as f:
+                data = orjson.loads(await f.read())
             
             return self._deserialize_token(data)
             
-        except (json.JSONDecodeError, KeyError, ValueError) as e:
+        except (orjson.JSONDecodeError, KeyError, ValueError) as e:
             # Corrupted file, delete it
             await aiofiles.os.remove(token_path)
             raise StoreError(f"Corrupted token file for {provider}/{key_id}: {e}")
@@ -154,6 +215,8 @@ class FileStore(BaseStore):
         metadata_path = self._get_metadata_path(provider, key_id)
         
         deleted = False
+        self._expiry_index.pop((provider, key_id), None)
+        self._compact_expiry_heap()
         
         # Delete token file
         if await aiofiles.os.path.exists(token_path):
@@ -166,6 +229,46 @@ class FileStore(BaseStore):
         
         return deleted
     
+    async def pop_token(
+        self,
+        provider: str,
+        key_id: str,
+    ) -> Optional[TokenData]:
+        """
+        Delete token from file store and return it.
+        
+        The token file is claimed with a single atomic rename, so of several
+        concurrent pops (or a pop racing a delete) only one gets the token.
+        
+        Args:
+            provider: Provider name
+            key_id: Unique identifier for the token
+            
+        Returns:
+            The deleted TokenData, or None if not found
+        """
+        token_path = self._get_token_path(provider, key_id)
+        metadata_path = self._get_metadata_path(provider, key_id)
+        claimed_path = token_path.with_name(f"{token_path.name}.{uuid.uuid4().hex}.pop")
+        
+        try:
+            await aiofiles.os.rename(token_path, claimed_path)
+        except FileNotFoundError:
+            return None
+        self._expiry_index.pop((provider, key_id), None)
+        self._compact_expiry_heap()
+        
+        try:
+            async with aiofiles.open(claimed_path, "rb") as f:
+                data = orjson.loads(await f.read())
+            return self._deserialize_token(data)
+        except (orjson.JSONDecodeError, KeyError, ValueError) as e:
+            raise StoreError(f"Corrupted token file for {provider}/{key_id}: {e}")
+        finally:
+            await aiofiles.os.remove(claimed_path)
+            if await aiofiles.os.path.exists(metadata_path):
+                await aiofiles.os.remove(metadata_path)
+    
     async def list_tokens(
         self,
         provider: Optional[str] = None,
@@ -274,23 +377,35 @@ class FileStore(BaseStore):
         """
         Clean up expired tokens from file store.
         
+        Only tokens popped off the expiry heap are read back from disk, so the
+        cost is proportional to the number of expired tokens.
+        
         Returns:
             Number of tokens cleaned up
         """
         count = 0
-        tokens = await self.list_tokens()
+        now = time.time()
         
-        for token_info in tokens:
-            provider = token_info.get("provider")
-            key_id = token_info.get("key_id")
-            
-            if not provider or not key_id:
+        # delete_token/_track_expiry may rebuild the heap, so don't alias it
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_ts, provider, key_id = heapq.heappop(self._expiry_heap)
+            if self._expiry_index.get((provider, key_id)) != expires_ts:
+                # Superseded by a later save or already deleted
                 continue
             
-            token_data = await self.get_token(provider, key_id)
+            # Re-check on disk in case the file was replaced by another process
+            try:
+                token_data = await self.get_token(provider, key_id)
+            except StoreError:
+                self._expiry_index.pop((provider, key_id), None)
+                continue
             if token_data and token_data.is_expired():
                 await self.delete_token(provider, key_id)
                 count += 1
+            else:
+                self._expiry_index.pop((provider, key_id), None)
+                if token_data:
+                    self._track_expiry(provider, key_id, token_data)
         
         return count
     
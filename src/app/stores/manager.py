@@ -4,6 +4,7 @@ Manages multiple storage backends and provides a unified interface.
 """
 
 import asyncio
+from pathlib import Path
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 
@@ -149,6 +150,26 @@ class StoreManager:
         store = self.get_store(store_type)
         return await store.delete_token(provider, key_id)
     
+    async def pop_token(
+        self,
+        provider: str,
+        key_id: str,
+        store_type: str = "file",
+    ) -> Optional[TokenData]:
+        """
+        Delete token from store and return it.
+        
+        Args:
+            provider: Provider name
+            key_id: Unique identifier for the token
+            store_type: Store type to use
+            
+        Returns:
+            The deleted TokenData, or None if not found
+        """
+        store = self.get_store(store_type)
+        return await store.pop_token(provider, key_id)
+    
     async def list_tokens(
         self,
         provider: Optional[str] = None,
@@ -251,7 +272,6 @@ class StoreManager:
         store = self.get_store(store_type)
         
         if hasattr(store, "backup"):
-            from pathlib import Path
             backup_path = Path(backup_dir)
             await store.backup(backup_path)
         else:
@@ -4,8 +4,13 @@ Provides async HTTP client with proxy support, retry logic, and connection pooli
 """
 
 import asyncio
+import contextlib
+import importlib.util
+import random
 import ssl
-from typing import Dict, Optional, Any
+import time
+from email.utils import parsedate_to_datetime
+from typing import AsyncContextManager, Dict, Optional, Any, Tuple
 from urllib.parse import urlparse
 
 import httpx
@@ -14,6 +19,13 @@ import structlog
 
 logger = structlog.get_logger(__name__)
 
+# httpx only speaks HTTP/2 when the optional h2 package is installed
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Backoff delays are scaled by a random factor in [1 - jitter, 1 + jitter]
+# so clients that failed together don't retry in lockstep
+RETRY_JITTER = 0.5
+
 
 class HTTPClient:
     """Async HTTP client with proxy support and retry logic."""
@@ -41,6 +53,7 @@ class HTTPClient:
         self.timeout = timeout
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.max_retry_interval = float(getattr(config, "max_retry_interval", 30))
         
         # Configure proxy
         self.proxy_config = self._configure_proxy()
@@ -96,12 +109,23 @@ class HTTPClient:
         """Create HTTP client with configured settings."""
         transport_kwargs = {}
         
-        # Configure proxy transport if proxy is set
+        # Upstream APIs multiplex over HTTP/2, so a few long-lived
+        # connections carry most of the traffic
+        limits = Limits(
+            max_connections=getattr(self.config, "http_max_connections", 64),
+            max_keepalive_connections=getattr(self.config, "http_max_keepalive_connections", 32),
+            keepalive_expiry=60.0,
+        )
+        
+        # Configure proxy transport if proxy is set; a custom transport
+        # ignores the client's pool settings, so they are passed here too
         if self.proxy_config:
             transport = httpx.AsyncHTTPTransport(
                 proxy=self.proxy_config,
                 verify=self.ssl_context,
                 retries=self.max_retries,
+                limits=limits,
+                http2=HTTP2_AVAILABLE,
             )
             transport_kwargs["transport"] = transport
         
@@ -119,11 +143,8 @@ class HTTPClient:
                 write=self.timeout,
                 pool=5.0,
             ),
-            limits=Limits(
-                max_connections=100,
-                max_keepalive_connections=20,
-                keepalive_expiry=30.0,
-            ),
+            limits=limits,
+            http2=HTTP2_AVAILABLE,
             follow_redirects=True,
             verify=self.ssl_context if not self.proxy_config else False,
             **transport_kwargs,
@@ -142,6 +163,7 @@ class HTTPClient:
         self,
         method: str,
         url: str,
+        limiter: Optional[AsyncContextManager[Any]] = None,
         **kwargs
     ) -> httpx.Response:
         """
@@ -150,11 +172,15 @@ class HTTPClient:
         Args:
             method: HTTP method
             url: URL to request
+            limiter: Held around each attempt (e.g. a semaphore), but not
+                across the backoff sleeps between attempts
             **kwargs: Additional arguments for httpx
             
         Returns:
             HTTP response
         """
+        if limiter is None:
+            limiter = contextlib.nullcontext()
         last_exception = None
         
         for attempt in range(self.max_retries + 1):
@@ -173,12 +199,13 @@ class HTTPClient:
                     max_attempts=self.max_retries + 1,
                 )
                 
-                response = await self.client.request(method, url, **kwargs)
+                async with limiter:
+                    response = await self.client.request(method, url, **kwargs)
                 
                 # Check if we should retry
                 if self._should_retry(response.status_code, attempt):
                     if attempt < self.max_retries:
-                        delay = self.retry_delay * (2 ** attempt)  # Exponential backoff
+                        delay = self._retry_delay(attempt, response)
                         logger.warning(
                             "Request failed, retrying",
                             method=method,
@@ -204,7 +231,7 @@ class HTTPClient:
             except (httpx.TimeoutException, httpx.ConnectError) as e:
                 last_exception = e
                 if attempt < self.max_retries:
-                    delay = self.retry_delay * (2 ** attempt)
+                    delay = self._retry_delay(attempt)
                     logger.warning(
                         "Network error, retrying",
                         method=method,
@@ -241,6 +268,44 @@ class HTTPClient:
         else:
             raise RuntimeError("HTTP request failed without exception")
     
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """
+        Compute how long to wait before the next attempt.
+        
+        A Retry-After header on the response wins; otherwise the delay is
+        jittered exponential backoff. Both are capped at max_retry_interval.
+        
+        Args:
+            attempt: Zero-based number of the attempt that just failed
+            response: Response that triggered the retry, if any
+            
+        Returns:
+            Delay in seconds
+        """
+        if response is not None:
+            retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.max_retry_interval)
+        
+        delay = self.retry_delay * (2 ** attempt) * random.uniform(1 - RETRY_JITTER, 1 + RETRY_JITTER)
+        return min(delay, self.max_retry_interval)
+    
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Parse a Retry-After header given either as seconds or as an HTTP date."""
+        if not value:
+            return None
+        
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+    
     def _should_retry(self, status_code: int, attempt: int) -> bool:
         """
         Determine if a request should be retried.
@@ -282,11 +347,65 @@ class HTTPClient:
         """Make DELETE request."""
         return await self.request("DELETE", url, **kwargs)
     
-    def stream_post(self, url: str, **kwargs):
+    async def probe(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        timeout: float,
+        max_error_bytes: int,
+        limiter: Optional[AsyncContextManager[Any]] = None,
+    ) -> Tuple[int, bytes, httpx.Headers]:
         """
-        Make streaming POST request.
+        GET a URL only to learn its status, retrying transient failures.
+        
+        The response is streamed so a successful (200 or 304) body is never
+        downloaded; on failure at most max_error_bytes of it are read.
         
         Args:
+            url: URL to request
+            headers: Request headers
+            timeout: Request timeout in seconds
+            max_error_bytes: How much of an error body to return
+            limiter: Held around each attempt (e.g. a semaphore), but not
+                across the backoff sleeps between attempts
+            
+        Returns:
+            Tuple of the final status code, the start of its body (empty on
+            success) and the response headers
+        """
+        if limiter is None:
+            limiter = contextlib.nullcontext()
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with limiter, self.stream("GET", url, headers=headers, timeout=timeout) as response:
+                    if response.status_code in (200, 304):
+                        return response.status_code, b"", response.headers
+                    
+                    if not self._should_retry(response.status_code, attempt):
+                        error_body = b""
+                        async for chunk in response.aiter_bytes():
+                            error_body += chunk
+                            if len(error_body) >= max_error_bytes:
+                                break
+                        return response.status_code, error_body[:max_error_bytes], response.headers
+                    
+                    delay = self._retry_delay(attempt, response)
+            except (httpx.TimeoutException, httpx.ConnectError):
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._retry_delay(attempt)
+            
+            logger.debug("Probe failed, retrying", url=url, attempt=attempt + 1, delay=delay)
+            await asyncio.sleep(delay)
+        
+        raise RuntimeError("HTTP probe failed without a response")
+    
+    def stream(self, method: str, url: str, **kwargs):
+        """
+        Make streaming request.
+        
+        Args:
+            method: HTTP method
             url: URL to request
             **kwargs: Additional arguments for httpx
             
@@ -298,7 +417,20 @@ class HTTPClient:
         headers.update(kwargs.get("headers", {}))
         kwargs["headers"] = headers
         
-        return self.client.stream("POST", url, **kwargs)
+        return self.client.stream(method, url, **kwargs)
+    
+    def stream_post(self, url: str, **kwargs):
+        """
+        Make streaming POST request.
+        
+        Args:
+            url: URL to request
+            **kwargs: Additional arguments for httpx
+            
+        Returns:
+            Async context manager for streaming response
+        """
+        return self.stream("POST", url, **kwargs)
     
     async def aclose(self) -> None:
         """Close the HTTP client."""
@@ -322,6 +454,10 @@ def get_http_client(config: Optional[Any] = None) -> HTTPClient:
     """
     Get or create global HTTP client instance.
     
+    The instance owns the connection pool shared by every provider, so
+    callers must not wrap it in ``async with`` or close it themselves;
+    close_http_client() does that at application shutdown.
+    
     Args:
         config: Application configuration (required on first call)
         
@@ -339,6 +475,10 @@ def get_http_client(config: Optional[Any] = None) -> HTTPClient:
             timeout=getattr(config, "request_timeout", 30.0),
             max_retries=getattr(config, "request_retry", 3),
         )
+        
+        if not HTTP2_AVAILABLE:
+            # Concurrent upstream calls then each need their own HTTP/1.1 connection
+            logger.warning("h2 is not installed; upstream requests will use HTTP/1.1 (install httpx[http2])")
     
     return _http_client
 
@@ -0,0 +1,95 @@
+"""
+Tests for the streaming chat completions endpoint.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import orjson
+import pytest
+from fastapi import FastAPI
+
+import src.app.auth  # noqa: F401  (resolves the auth/stores import cycle)
+from src.app.api.routes import router
+
+
+def _make_app(stream, flush_interval=0.005):
+    """Build an app serving the API router on top of a fake provider stream."""
+    app = FastAPI()
+    app.include_router(router, prefix="/v1")
+    app.state.provider_registry = SimpleNamespace(chat_completion_stream=stream)
+    app.state.config = SimpleNamespace(
+        stream_flush_bytes=65536,
+        stream_flush_interval=flush_interval,
+    )
+    return app
+
+
+async def _stream_chat(app, writes):
+    """Call the endpoint over raw ASGI, recording (seconds, body) per write."""
+    loop = asyncio.get_running_loop()
+    body = orjson.dumps({
+        "model": "m",
+        "messages": [{"role": "user", "content": "hi"}],
+        "stream": True,
+    })
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/v1/chat/completions",
+        "raw_path": b"/v1/chat/completions",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("test", 1),
+        "server": ("test", 80),
+    }
+    received = False
+    start = loop.time()
+    
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.sleep(3600)
+    
+    async def send(message):
+        if message["type"] == "http.response.body" and message.get("body"):
+            writes.append((loop.time() - start, message["body"]))
+    
+    await app(scope, receive, send)
+
+
+def test_buffered_frames_flush_during_upstream_pause():
+    async def stream(**kwargs):
+        yield {"n": 1}
+        yield {"n": 2}
+        await asyncio.sleep(0.3)
+        yield {"n": 3}
+    
+    writes = []
+    asyncio.run(_stream_chat(_make_app(stream), writes))
+    
+    assert writes[0][1] == b'data: {"n":1}\n\ndata: {"n":2}\n\n'
+    assert writes[0][0] < 0.2
+    assert b"".join(body for _, body in writes).endswith(b'data: {"n":3}\n\ndata: [DONE]\n\n')
+
+
+def test_buffered_frames_are_sent_before_upstream_error():
+    async def stream(**kwargs):
+        yield {"n": 1}
+        yield {"n": 2}
+        raise RuntimeError("upstream failed")
+    
+    # A long interval keeps both frames buffered when the error is raised
+    writes = []
+    with pytest.raises(RuntimeError, match="upstream failed"):
+        asyncio.run(_stream_chat(_make_app(stream, flush_interval=10.0), writes))
+    
+    assert b"".join(body for _, body in writes) == (
+        b'data: {"n":1}\n\ndata: {"n":2}\n\n'
+    )
@@ -0,0 +1,43 @@
+"""
+Tests for ClaudeAuth's prompt caching support.
+"""
+
+import asyncio
+
+import httpx
+
+import src.app.auth  # noqa: F401  (resolves the auth/stores import cycle)
+from src.app.auth.base import TokenData
+from src.app.auth.claude import ClaudeAuth
+from src.app.config import AppConfig
+from src.app.utils.http_client import HTTPClient
+
+
+def test_prompt_cache_betas_only_sent_with_cache_ttl():
+    betas = []
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        betas.append(request.headers.get("anthropic-beta"))
+        return httpx.Response(200, content=b"{}")
+    
+    config = AppConfig()
+    http_client = HTTPClient(config)
+    http_client.client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler),
+        base_url="https://api.anthropic.com",
+    )
+    auth = ClaudeAuth(config, http_client)
+    token = TokenData(access_token="sk-ant-api03-tenant-one")
+    messages = [{"role": "user", "content": "hi"}]
+    
+    async def run():
+        await auth.create_message(token, "claude-3", messages)
+        await auth.create_message(token, "claude-3", messages, cache_ttl=5)
+        await auth.create_message(token, "claude-3", messages, cache_ttl=60)
+    
+    asyncio.run(run())
+    
+    assert betas[0] == "max-tokens-2024-07-15"
+    assert "prompt-caching-2024-07-31" in betas[1]
+    assert "extended-cache-ttl-2025-04-11" not in betas[1]
+    assert "extended-cache-ttl-2025-04-11" in betas[2]
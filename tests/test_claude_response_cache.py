@@ -0,0 +1,64 @@
+"""
+Tests for ClaudeAuth's response cache.
+"""
+
+import asyncio
+
+import httpx
+import orjson
+
+import src.app.auth  # noqa: F401  (resolves the auth/stores import cycle)
+from src.app.auth.base import TokenData
+from src.app.auth.claude import ClaudeAuth
+from src.app.config import AppConfig
+from src.app.utils.http_client import HTTPClient
+
+
+def _make_auth(calls):
+    """Build a ClaudeAuth whose upstream echoes back the calling key."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        key = request.headers.get("x-api-key")
+        calls.append(key)
+        return httpx.Response(200, content=orjson.dumps({"answered_for": key}))
+    
+    config = AppConfig()
+    config.response_cache_ttl = 60
+    http_client = HTTPClient(config)
+    http_client.client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler),
+        base_url="https://api.anthropic.com",
+    )
+    return ClaudeAuth(config, http_client)
+
+
+def test_keys_with_same_prefix_do_not_share_entries():
+    calls = []
+    auth = _make_auth(calls)
+    # Both keys share the 8-character key_id Anthropic keys get by default
+    first = TokenData(access_token="sk-ant-api03-tenant-one", extra_data={"key_id": "sk-ant-a"})
+    second = TokenData(access_token="sk-ant-api03-tenant-two", extra_data={"key_id": "sk-ant-a"})
+    messages = [{"role": "user", "content": "hi"}]
+    
+    async def run():
+        return [
+            await auth.create_message(first, "claude-3", messages, temperature=0),
+            await auth.create_message(second, "claude-3", messages, temperature=0),
+            await auth.create_message(first, "claude-3", messages, temperature=0),
+        ]
+    
+    results = asyncio.run(run())
+    
+    assert results[0] == {"answered_for": "sk-ant-api03-tenant-one"}
+    assert results[1] == {"answered_for": "sk-ant-api03-tenant-two"}
+    assert results[2] == results[0]
+    # The repeat from the first tenant is the only request served from cache
+    assert calls == ["sk-ant-api03-tenant-one", "sk-ant-api03-tenant-two"]
+
+
+def test_non_numeric_temperature_skips_cache():
+    auth = _make_auth([])
+    token = TokenData(access_token="sk-ant-api03-tenant-one")
+    
+    assert auth._response_cache_key(token, b"{}", {"temperature": "0.5"}) is None
+    assert auth._response_cache_key(token, b"{}", {"temperature": None}) is None
+    assert auth._response_cache_key(token, b"{}", {"temperature": 0}) is not None
@@ -0,0 +1,34 @@
+"""
+Tests for configuration loading.
+"""
+
+from src.app.config import AppConfig
+
+
+def test_from_file_cache_sees_env_override_changes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("CLIPROXY_DEBUG", raising=False)
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text("port: 9000\n", encoding="utf-8")
+    
+    assert AppConfig.from_file(str(config_file)).debug is False
+    
+    monkeypatch.setenv("CLIPROXY_DEBUG", "true")
+    config = AppConfig.from_file(str(config_file))
+    assert config.debug is True
+    assert config.port == 9000
+    
+    monkeypatch.delenv("CLIPROXY_DEBUG")
+    assert AppConfig.from_file(str(config_file)).debug is False
+
+
+def test_from_file_reuses_config_while_inputs_unchanged(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text("port: 9000\n", encoding="utf-8")
+    
+    first = AppConfig.from_file(str(config_file))
+    first.port = 1
+    
+    # The cached instance is copied, so mutating a result doesn't leak
+    assert AppConfig.from_file(str(config_file)).port == 9000
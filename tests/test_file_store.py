@@ -0,0 +1,66 @@
+"""
+Tests for FileStore.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import src.app.auth  # noqa: F401  (resolves the auth/stores import cycle)
+from src.app.auth.base import TokenData
+from src.app.stores.file_store import EXPIRY_HEAP_SLACK, FileStore
+
+
+def _make_store(tmp_path):
+    store = FileStore(SimpleNamespace(auth_dir=str(tmp_path)))
+    asyncio.run(store.initialize())
+    return store
+
+
+def test_pop_token_returns_and_removes_token(tmp_path):
+    store = _make_store(tmp_path)
+    
+    async def run():
+        await store.save_token("claude", "k1", TokenData(access_token="secret"), metadata={})
+        popped = await store.pop_token("claude", "k1")
+        return popped, await store.get_token("claude", "k1"), await store.pop_token("claude", "k1")
+    
+    popped, after, popped_again = asyncio.run(run())
+    
+    assert popped.access_token == "secret"
+    assert after is None
+    assert popped_again is None
+    assert not store._get_metadata_path("claude", "k1").exists()
+    assert list((tmp_path / "tokens" / "claude").iterdir()) == []
+
+
+def test_concurrent_pops_return_token_once(tmp_path):
+    store = _make_store(tmp_path)
+    
+    async def run():
+        await store.save_token("claude", "k1", TokenData(access_token="secret"))
+        return await asyncio.gather(*(store.pop_token("claude", "k1") for _ in range(5)))
+    
+    results = asyncio.run(run())
+    
+    assert sum(result is not None for result in results) == 1
+
+
+def test_expiry_heap_stays_bounded_across_refreshes(tmp_path):
+    store = _make_store(tmp_path)
+    now = datetime.utcnow()
+    
+    async def run():
+        # Refresh the same token many times, then let a second one expire
+        for minutes in range(1, 501):
+            token = TokenData(access_token="a", expires_at=now + timedelta(minutes=minutes))
+            await store.save_token("claude", "live", token)
+        expired = TokenData(access_token="b", expires_at=now - timedelta(minutes=1))
+        await store.save_token("claude", "expired", expired)
+        return await store.cleanup_expired_tokens()
+    
+    cleaned = asyncio.run(run())
+    
+    assert cleaned == 1
+    assert len(store._expiry_heap) <= 2 * len(store._expiry_index) + EXPIRY_HEAP_SLACK + 1
+    assert list(store._expiry_index) == [("claude", "live")]
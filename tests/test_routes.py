@@ -0,0 +1,25 @@
+"""
+Tests for API route request handling.
+"""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import src.app.auth  # noqa: F401  (resolves the auth/stores import cycle)
+from src.app.api.routes import router
+
+
+def test_malformed_json_body_is_rejected_with_400():
+    app = FastAPI()
+    app.include_router(router, prefix="/v1")
+    app.state.provider_registry = None
+    client = TestClient(app)
+    
+    response = client.post(
+        "/v1/chat/completions",
+        content=b"{not json",
+        headers={"content-type": "application/json"},
+    )
+    
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid JSON body"}